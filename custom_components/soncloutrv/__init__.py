@@ -56,11 +56,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN][entry.entry_id] = {
         "config": entry.data,
         "entities": [],  # Will store entity references
+        "climate": None,  # The SonClouTRVClimate of this entry (direct lookup)
+        # Number entities with a debounced, not yet saved value
+        "pending_numbers": set(),
     }
 
     # Global room registry: groups SonTRV climates by external temperature sensor
     # so that we can later coordinate PID control per room.
     hass.data[DOMAIN].setdefault("rooms", {})
+    # Shared room PID state (RoomPIDState per room key), read by the room sensor.
+    hass.data[DOMAIN].setdefault("room_states", {})
+    # Per entry: number of pending entry updates that were already applied at
+    # runtime and must not trigger a reload (see async_reload_entry). Kept
+    # outside the entry bucket, so it survives the bucket swap of a reload.
+    hass.data[DOMAIN].setdefault("runtime_updates", {})
 
     try:
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -121,6 +130,10 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    # Save pending slider values before the entities and the bucket go away
+    for number in list(hass.data[DOMAIN][entry.entry_id]["pending_numbers"]):
+        number.async_flush_pending()
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
@@ -131,5 +144,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
+    runtime_updates = hass.data.get(DOMAIN, {}).get("runtime_updates", {})
+    if runtime_updates.get(entry.entry_id):
+        # Change already applied to the running entities (or saved right
+        # before they were unloaded), no reload needed
+        runtime_updates[entry.entry_id] -= 1
+        return
     await async_unload_entry(hass, entry)
     await async_setup_entry(hass, entry)
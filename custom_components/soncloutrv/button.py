@@ -10,7 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.event import async_call_later
 
-from .const import DOMAIN
+from .const import DOMAIN, MANUFACTURER, MODEL
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,8 +45,8 @@ class ValveExerciseButton(ButtonEntity):
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, config_entry.entry_id)},
             name=f"SonTRV {config_entry.data['name']}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
+            manufacturer=MANUFACTURER,
+            model=MODEL,
             sw_version="1.0.0",
         )
         
@@ -59,18 +59,15 @@ class ValveExerciseButton(ButtonEntity):
         """Handle button press - execute valve exercise (5 min open, 5 min closed)."""
         # Find the climate entity from registry
         try:
-            found = False
-            for entity in self.hass.data[DOMAIN].get(self._config_entry.entry_id, {}).get("entities", []):
-                if hasattr(entity, '_entity_id_base'):
-                    found = True
-                    _LOGGER.info("%s: Manual valve exercise started", entity.name)
-                    
-                    # Delegate to climate entity
-                    await entity.async_trigger_valve_exercise()
-                    break
-            
-            if not found:
+            # The climate entity of this entry (registered by the climate platform)
+            entity = self.hass.data[DOMAIN].get(self._config_entry.entry_id, {}).get("climate")
+            if entity is None:
                 _LOGGER.warning("%s: Climate entity not found in registry, manual exercise skipped", self._attr_name)
+            else:
+                _LOGGER.info("%s: Manual valve exercise started", entity.name)
+
+                # Delegate to climate entity
+                await entity.async_trigger_valve_exercise()
         except Exception as err:
             _LOGGER.error("%s: Error in manual exercise lookup: %s", self._attr_name, err)
     
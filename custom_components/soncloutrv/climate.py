@@ -2,10 +2,15 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+from collections import deque
+from collections.abc import Mapping
 from datetime import timedelta
+from functools import lru_cache
 import logging
 import csv
 import os
+import sys
 from typing import Any
 
 from homeassistant.components.climate import (
@@ -23,10 +28,11 @@ from homeassistant.const import (
     STATE_UNKNOWN,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant, State, callback
 from homeassistant.helpers import entity_platform, device_registry as dr
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_state_change_event,
     async_track_point_in_time,
 )
@@ -36,6 +42,8 @@ from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    MANUFACTURER,
+    MODEL,
     CONF_VALVE_ENTITY,
     CONF_TEMP_SENSOR,
     CONF_MIN_TEMP,
@@ -113,21 +121,193 @@ class RoomPIDState:
     same room learn together and expose a common debug state.
     """
 
+    __slots__ = (
+        "integral_error",
+        "prev_error",
+        "prev_temp",
+        "last_calc_time",
+        "last_calc_mono",
+        "last_output",
+        "last_target",
+        "avg_error",
+        "last_p",
+        "last_i",
+        "last_d",
+        "last_ff",
+        "last_calc_entity",
+    )
+
     def __init__(self) -> None:
         # Integral of the room error over time (shared across all TRVs in room)
         self.integral_error: float = 0.0
         # Previous error value for derivative calculation
         self.prev_error: float = 0.0
+        # Previous room temperature for the derivative on measurement
+        self.prev_temp: float | None = None
         # Timestamp of last PID calculation
         self.last_calc_time = None
+        # Monotone Loop-Zeit der letzten Berechnung (für dt, ohne datetime-Arithmetik)
+        self.last_calc_mono: float | None = None
         # Last computed PID output in percent (0-100) representing the
         # *room-level* heating demand. This is used for room debug sensors.
         self.last_output: float = 0.0
+        # Target temperature the last output was computed for
+        self.last_target: float | None = None
         # Exponentially smoothed average absolute error for adaptive Ki scaling
         # (room-level). This allows slow "learning" of how far der Raum typischer-
         # weise vom Soll abweicht und verstärkt den I-Anteil automatisch, wenn der
         # Raum dauerhaft zu kalt/zu warm bleibt.
         self.avg_error: float = 0.0
+        # Last P/I/D/FF terms, so that climates reusing the room output can
+        # mirror them in their debug attributes.
+        self.last_p: float = 0.0
+        self.last_i: float = 0.0
+        self.last_d: float = 0.0
+        self.last_ff: float = 0.0
+        # entity_id of the climate that performed the last calculation
+        self.last_calc_entity: str | None = None
+
+
+# Column layout of the optional room CSV log (one row per control cycle).
+ROOM_LOG_HEADER = (
+    "timestamp",
+    "room_key",
+    "climate_entity",
+    "room_temp",
+    "target_temp",
+    "error",
+    "room_demand_percent",
+    "valve_opening_percent",
+    "max_valve_position",
+    "outside_temp",
+    "outside_sensor",
+    "hvac_mode",
+    "hvac_action",
+    "kp",
+    "ki",
+    "kd",
+    "ka",
+    "pid_p",
+    "pid_i",
+    "pid_d",
+    "pid_ff",
+    "pid_integral_error",
+    "window_freeze_active",
+    "window_sensor_open",
+    "window_sensor_scope",
+    "window_sensors",
+    "post_window_soft_active",
+)
+# Buffered room log rows are written once this many rows are pending or the
+# oldest pending row is this many seconds old (and always on shutdown).
+ROOM_LOG_FLUSH_ROWS = 32
+ROOM_LOG_FLUSH_INTERVAL = 60
+
+
+class RoomLogWriter:
+    """Batched CSV writer shared by all climates logging into the same file.
+
+    Rows are queued from the event loop without blocking. A single background
+    task buffers them and appends them in batches from an executor thread,
+    every ROOM_LOG_FLUSH_ROWS rows or ROOM_LOG_FLUSH_INTERVAL seconds. The file
+    is opened once and kept open until the last climate using it is removed.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        self._hass = hass
+        self._path = path
+        self._queue: asyncio.Queue[list[Any] | None] = asyncio.Queue()
+        self._file = None
+        self._writer = None
+        self._task: asyncio.Task | None = None
+        # Number of climate entities currently using this writer
+        self.users = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start the background writer task."""
+        self._task = self._hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} room log writer {self._path}"
+        )
+
+    @callback
+    def async_enqueue(self, row: list[Any]) -> None:
+        """Queue a row for writing (never blocks the event loop)."""
+        self._queue.put_nowait(row)
+
+    async def async_stop(self) -> None:
+        """Write all pending rows, stop the task and close the file."""
+        self._queue.put_nowait(None)
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self._hass.async_add_executor_job(self._close)
+
+    async def _async_run(self) -> None:
+        """Buffer queued rows and hand them to the executor in batches."""
+        loop = self._hass.loop
+        pending: list[list[Any]] = []
+        flush_at = 0.0
+        stopping = False
+        while not stopping:
+            timeout = max(0.0, flush_at - loop.time()) if pending else None
+            try:
+                row = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                # Home Assistant shutdown: do not lose the buffered rows
+                if pending:
+                    await self._hass.async_add_executor_job(self._write_rows, pending)
+                raise
+            else:
+                if row is not None and not pending:
+                    flush_at = loop.time() + ROOM_LOG_FLUSH_INTERVAL
+                # Drain everything already queued without another wait_for
+                while row is not None:
+                    pending.append(row)
+                    try:
+                        row = self._queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                if row is None:
+                    stopping = True
+                elif len(pending) < ROOM_LOG_FLUSH_ROWS and loop.time() < flush_at:
+                    continue
+            if pending:
+                batch, pending = pending, []
+                await self._hass.async_add_executor_job(self._write_rows, batch)
+
+    def _write_rows(self, rows: list[list[Any]]) -> None:
+        """Append rows to the CSV file (runs in an executor thread).
+
+        The file is created on first use and a header row is written once.
+        """
+        try:
+            if self._file is None:
+                dirname = os.path.dirname(self._path)
+                if dirname:
+                    os.makedirs(dirname, exist_ok=True)
+                file_exists = os.path.isfile(self._path)
+                self._file = open(self._path, "a", newline="", buffering=64 * 1024)
+                self._writer = csv.writer(self._file)
+                if not file_exists:
+                    self._writer.writerow(ROOM_LOG_HEADER)
+            self._writer.writerows(rows)
+            self._file.flush()
+        except OSError as err:
+            _LOGGER.error("Failed to append room log rows to %s: %s", self._path, err)
+            self._close()
+
+    def _close(self) -> None:
+        """Close the CSV file if it is open (runs in an executor thread)."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+            self._writer = None
 
 
 SCAN_INTERVAL = timedelta(minutes=5)  # Fußbodenheizung ist träge, 5 Minuten reichen
@@ -140,6 +320,119 @@ WINDOW_STABLE_BAND = DEFAULT_WINDOW_STABLE_BAND
 WINDOW_MAX_FREEZE = DEFAULT_WINDOW_MAX_FREEZE
 # Time window (in seconds) to look back for sudden drop detection
 WINDOW_DROP_WINDOW = 300  # 5 minutes
+# Climates of one room that run their control loop within this many seconds
+# of each other (same tick) share one PID computation, the leader too, as long
+# as the computing climate heats towards the same target. Prevents integrating
+# the same room error twice.
+ROOM_PID_TICK = 0.5
+# Supported HVAC modes and presets (one preset per valve opening step)
+HVAC_MODES = (HVACMode.HEAT, HVACMode.OFF)
+PRESET_MODES = tuple(VALVE_OPENING_STEPS)
+
+# Safety heartbeat (in seconds) of the control loop while there is nothing to
+# regulate (room stable or heating off). Input changes (temperature, target,
+# mode, preset, window) still trigger the control loop immediately.
+CONTROL_HEARTBEAT_INTERVAL = 1800
+# Coalescing window (in seconds) for bursts of TRV attribute reports
+VALVE_STATE_DEBOUNCE = 0.1
+# Error-dependent Kp scaling: |error| above GAIN_SCALE_THRESHOLDS[i] (in K)
+# selects GAIN_SCALE_VALUES[i + 1]; within 0.3 K Kp stays as configured.
+GAIN_SCALE_THRESHOLDS = (0.3, 0.7, 1.2, 1.8)
+GAIN_SCALE_VALUES = (1.0, 1.2, 1.4, 1.7, 2.0)
+# Number of temperature readings kept for trend and window recovery checks
+TEMP_HISTORY_LENGTH = 20
+# An unchanged valve opening is re-sent to the TRV at most this often
+# (in seconds), so repeated writes of the same value skip the Zigbee traffic
+VALVE_RESEND_INTERVAL = 1800
+# Duration (in seconds) of the fully-open and fully-closed exercise steps
+VALVE_EXERCISE_STEP_DURATION = 300
+# Number of valve openings kept for the average valve position attribute
+VALVE_HISTORY_LENGTH = 10
+# MQTT payload strings for the integer percent values 0..100 (valve degrees,
+# position limit), built once instead of str() per publish
+_PERCENT_PAYLOADS = tuple(str(i) for i in range(101))
+
+
+# TRV attribute names, in order of preference
+_VALVE_POSITION_ATTRS = ("position", "valve_position")
+_BATTERY_ATTRS = ("_battery", "battery")
+_TRV_TEMP_ATTRS = ("local_temperature", "current_temperature", "temperature")
+
+
+def _parse_valve_position(attributes: Mapping[str, Any]) -> int | None:
+    """Return the TRV valve position (0=closed, 100=open), if reported."""
+    for name in _VALVE_POSITION_ATTRS:
+        value = attributes.get(name)
+        if value is not None:
+            try:
+                return int(value)
+            except (ValueError, TypeError):
+                return None
+    return None
+
+
+@lru_cache(maxsize=128)
+def _parse_battery_str(value: str) -> float | None:
+    """Parse a battery string such as "85%" (memoized, TRVs repeat it)."""
+    try:
+        return float(value.replace("%", "").strip())
+    except ValueError:
+        return None
+
+
+def _parse_battery(attributes: Mapping[str, Any]) -> float | None:
+    """Return the TRV battery level in percent (numeric or "85%" strings)."""
+    for name in _BATTERY_ATTRS:
+        value = attributes.get(name)
+        if isinstance(value, (int, float)):
+            return value
+        if isinstance(value, str):
+            if (battery := _parse_battery_str(value)) is not None:
+                return battery
+    return None
+
+
+def _parse_trv_temp(attributes: Mapping[str, Any]) -> float | None:
+    """Return the TRV internal temperature, if reported."""
+    for name in _TRV_TEMP_ATTRS:
+        value = attributes.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                continue
+    return None
+
+
+def _weather_temperature(state: State) -> Any:
+    """Return the raw temperature attribute of a weather entity."""
+    temp = state.attributes.get("temperature")
+    if temp is None:
+        # Fallback: some integrations use 'current_temperature'
+        temp = state.attributes.get("current_temperature")
+    return temp
+
+
+# Domain specific extraction of the raw outside temperature. Sources without
+# an entry (plain sensors) report the temperature as their state.
+_OUTSIDE_TEMP_EXTRACTORS = {
+    "weather": _weather_temperature,
+}
+
+
+def _extract_outside_temp(state: State) -> float | None:
+    """Return the outside temperature of a sensor or weather state.
+
+    Returns None if the source is unavailable or has no temperature; raises
+    ValueError/TypeError if the value cannot be parsed.
+    """
+    if state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return None
+    extractor = _OUTSIDE_TEMP_EXTRACTORS.get(state.domain)
+    value = extractor(state) if extractor is not None else state.state
+    if value is None:
+        return None
+    return float(value)
 
 
 async def async_setup_entry(
@@ -155,6 +448,7 @@ async def async_setup_entry(
     # Store entity reference for number entities to access
     if config_entry.entry_id in hass.data[DOMAIN]:
         hass.data[DOMAIN][config_entry.entry_id]["entities"].append(climate_entity)
+        hass.data[DOMAIN][config_entry.entry_id]["climate"] = climate_entity
     
     async_add_entities([climate_entity], True)
     
@@ -180,8 +474,8 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         ClimateEntityFeature.TURN_ON |
         ClimateEntityFeature.PRESET_MODE
     )
-    _attr_hvac_modes = [HVACMode.HEAT, HVACMode.OFF]
-    _attr_preset_modes = ["*", "1", "2", "3", "4", "5"]
+    _attr_hvac_modes = HVAC_MODES
+    _attr_preset_modes = PRESET_MODES
 
     def __init__(
         self,
@@ -192,6 +486,8 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         """Initialize the climate device."""
         self.hass = hass
         self._config = config
+        # Interned: used as key in hass.data[DOMAIN] and in the device identifiers
+        entry_id = sys.intern(entry_id)
         self._entry_id = entry_id
         
         # Configuration
@@ -205,8 +501,8 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, entry_id)},
             name=f"SonTRV {config[CONF_NAME]}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
+            manufacturer=MANUFACTURER,
+            model=MODEL,
             sw_version="1.0.0",
             configuration_url="https://github.com/k2dp2k/soncloutrv",
         )
@@ -221,8 +517,10 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # Room grouping key: prefer explicit room_id if configured, otherwise
         # fall back to the external temperature sensor (backwards compatible
         # for existing installations without room_id in the config entry).
+        # Interned: used as key in the room registry, the shared room PID
+        # state and every CSV row.
         self._room_id = config.get(CONF_ROOM_ID)
-        self._room_key = self._room_id or self._temp_sensor
+        self._room_key = sys.intern(self._room_id or self._temp_sensor)
 
         # Room logging configuration (for external ML / analysis).
         # We initialize with defaults here; final values (including options
@@ -233,25 +531,42 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         room_log_file = DEFAULT_ROOM_LOG_FILE
         # Resolve to absolute path inside HA config directory
         self._room_log_path = hass.config.path(room_log_file)
-        
-        # Cache derived entity IDs to avoid repeated string manipulation
-        self._device_id = self._valve_entity.replace("climate.", "")
-        self._sensor_select_entity = self._valve_entity.replace("climate.", "select.") + "_temperature_sensor_select"
-        self._temp_input_entity = self._valve_entity.replace("climate.", "number.") + "_external_temperature_input"
-        self._valve_opening_entity = self._valve_entity.replace("climate.", "number.") + "_valve_opening_degree"
+        # Shared batched writer for the CSV file (acquired in async_added_to_hass)
+        self._room_log_writer: RoomLogWriter | None = None
+        
+        # Cache derived entity IDs to avoid repeated string manipulation.
+        # Interned, da sie bei jedem hass.states.get / Service-Call als
+        # Dict-Schlüssel verwendet werden.
+        device_id = self._valve_entity.replace("climate.", "")
+        self._device_id = sys.intern(device_id)
+        self._sensor_select_entity = sys.intern(f"select.{device_id}_temperature_sensor_select")
+        self._temp_input_entity = sys.intern(f"number.{device_id}_external_temperature_input")
+        self._valve_opening_entity = sys.intern(f"number.{device_id}_valve_opening_degree")
         # New: explicit entity for valve_closing_degree so we can keep open/close in sync
-        self._valve_closing_entity = self._valve_entity.replace("climate.", "number.") + "_valve_closing_degree"
-        self._calibration_entity = self._valve_entity.replace("climate.", "select.") + "_valve_calibration"
-        self._position_entity = self._valve_entity.replace("climate.", "number.") + "_position"
-        
-        # MQTT Topics
-        self._mqtt_topic_sensor_select = f"zigbee2mqtt/{self._device_id}/set/temperature_sensor_select"
-        self._mqtt_topic_ext_temp = f"zigbee2mqtt/{self._device_id}/set/external_temperature_input"
-        self._mqtt_topic_valve_open = f"zigbee2mqtt/{self._device_id}/set/valve_opening_degree"
+        self._valve_closing_entity = sys.intern(f"number.{device_id}_valve_closing_degree")
+        self._calibration_entity = sys.intern(f"select.{device_id}_valve_calibration")
+        self._position_entity = sys.intern(f"number.{device_id}_position")
+        
+        # MQTT Topics (alle Publish-Pfade verwenden ausschließlich diese Attribute)
+        topic_base = f"zigbee2mqtt/{device_id}/set/"
+        self._mqtt_topic_sensor_select = sys.intern(topic_base + "temperature_sensor_select")
+        self._mqtt_topic_ext_temp = sys.intern(topic_base + "external_temperature_input")
+        self._mqtt_topic_valve_open = sys.intern(topic_base + "valve_opening_degree")
         # New: MQTT topic for valve_closing_degree (inverse of opening)
-        self._mqtt_topic_valve_close = f"zigbee2mqtt/{self._device_id}/set/valve_closing_degree"
-        self._mqtt_topic_calibration = f"zigbee2mqtt/{self._device_id}/set/calibration"
-        self._mqtt_topic_position = f"zigbee2mqtt/{self._device_id}/set/position"
+        self._mqtt_topic_valve_close = sys.intern(topic_base + "valve_closing_degree")
+        self._mqtt_topic_calibration = sys.intern(topic_base + "calibration")
+        self._mqtt_topic_position = sys.intern(topic_base + "position")
+
+        # Konstante Service-Daten für die Sensor-Umschaltung auf "external".
+        # Werden nie verändert und können daher bei jedem Sync wiederverwendet werden.
+        self._sensor_select_call_data = {
+            "entity_id": self._sensor_select_entity,
+            "option": "external",
+        }
+        self._sensor_select_mqtt_data = {
+            "topic": self._mqtt_topic_sensor_select,
+            "payload": "external",
+        }
 
         self._attr_min_temp = config[CONF_MIN_TEMP]
         self._attr_max_temp = config[CONF_MAX_TEMP]
@@ -267,16 +582,17 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         self._min_cycle_duration = config.get(CONF_MIN_CYCLE_DURATION, 300)
         
         # Get max valve position from step selection
-        valve_step = config.get(CONF_VALVE_OPENING_STEP, config.get(CONF_MAX_VALVE_POSITION, "4"))
-        self._current_valve_step = str(valve_step)
-        self._attr_preset_mode = self._current_valve_step
+        raw_step = config.get(CONF_VALVE_OPENING_STEP, config.get(CONF_MAX_VALVE_POSITION, "4"))
+        step_key = str(raw_step)
+        self._current_valve_step = step_key
+        self._attr_preset_mode = step_key
         
-        if isinstance(valve_step, int):
+        if isinstance(raw_step, int):
             # Legacy support: if stored as int percentage, use it directly
-            self._max_valve_position = valve_step
+            self._max_valve_position = raw_step
         else:
             # New: convert step to percentage
-            self._max_valve_position = VALVE_OPENING_STEPS.get(str(valve_step), 80)
+            self._max_valve_position = VALVE_OPENING_STEPS.get(step_key, 80)
         
         # Use configured control mode or fall back to global default (PID)
         self._control_mode = config.get(CONF_CONTROL_MODE, DEFAULT_CONTROL_MODE)
@@ -299,10 +615,20 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         self._valve_position = 0
         self._active = False
         self._is_exercising = False  # Flag to suppress control loop during valve exercise
+        self._exercise_task: asyncio.Task | None = None
         self._last_valve_update = None
+        self._last_valve_update_mono: float | None = None  # loop.time() of last write (inertia)
         self._next_update_time = None # For adaptive polling
+        # ISO strings of the timestamps above, set together with them so the
+        # attribute refresh does not re-format unchanged datetimes
+        self._last_valve_update_iso: str | None = None
+        self._next_update_iso: str | None = None
         self._update_timer = None # Handle to cancel timer
-        self._last_temp_change = None
+        self._scheduled_interval: int | None = None  # Interval of the live timer
+        # Cached transport choice per helper entity: True = entity service, False = MQTT
+        # (invalidated when one of these entities is added or removed)
+        self._entity_transport: dict[str, bool] = {}
+        self._next_update_mono: float | None = None  # loop.time() deadline of the live timer
         self._last_set_valve_opening = -1  # Track last set value
         self._last_synced_temp = None  # For traffic optimization
         
@@ -319,6 +645,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # Window / sudden-drop detection state
         self._window_freeze_active = False
         self._window_freeze_start = None
+        self._window_freeze_since_iso: str | None = None
         # Temperatur direkt vor dem erkannten Drop (zum Vergleich nach dem Event)
         self._window_start_temp = None
         # Bisher niedrigste Temperatur während des Freeze (Talpunkt)
@@ -343,7 +670,8 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         self._pre_window_integral: float | None = None
         # Post-Window-Phase: Zeitraum, in dem wir Ausgang und Schrittweite
         # begrenzen, um ein "Vollgas" nach dem Fenster zu vermeiden.
-        self._post_window_soft_mode_until = None
+        # Deadline in monotoner Loop-Zeit (hass.loop.time()).
+        self._post_window_soft_mode_until: float | None = None
         # Max. zusätzliche Ventil-Öffnung (in %-Punkten Ventilöffnung) im
         # ersten Schritt nach dem Fenster, relativ zum Wert vor dem Event.
         # Konservativ, um nach Fenster-Events nicht zu viel Energie in den
@@ -366,20 +694,54 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         
         # Statistics
         self._valve_adjustments_count = 0
-        self._valve_position_history = []  # Keep last 10 values
-        self._temp_history = []  # Keep last N temperature readings
-        self._temp_time_history = []  # Timestamps for temperature readings
+        self._valve_position_history: deque[int] = deque(maxlen=VALVE_HISTORY_LENGTH)
+        self._valve_history_sum = 0  # Rolling sum of _valve_position_history
+        # Ring buffer of the last TEMP_HISTORY_LENGTH temperature readings
+        self._temp_history: deque[float] = deque(maxlen=TEMP_HISTORY_LENGTH)
+        # Monotone (fallende) Deque aus (Loop-Zeit, Temperatur) über die
+        # letzten WINDOW_DROP_WINDOW Sekunden: das Maximum steht immer vorne.
+        self._recent_max_window: deque[tuple[float, float]] = deque()
         self._trv_internal_temp = None
         self._trv_battery = None
         
-        # Initialize extra state attributes
+        # Initialize extra state attributes. Attributes that only change with
+        # the configuration are kept separately (see _refresh_static_attributes).
         self._attr_extra_state_attributes = {}
+        self._static_attrs: dict[str, Any] = {}
+        # Core state written last time (see _async_write_state)
+        self._last_written_state: tuple | None = None
         
         # Listeners
         self._remove_listeners = []
+        # Pending debounced state write after TRV reports (cancel callback)
+        self._valve_state_write_pending = None
 
         # Room membership (filled in async_added_to_hass)
         self._is_room_leader = False
+        self._room_pid_state: RoomPIDState | None = None
+
+        # Set at the end of async_added_to_hass; state writes from helpers are
+        # skipped until then (see _async_write_state).
+        self._setup_complete = False
+
+        # Output scaling derived from configuration (see _update_output_coefficients)
+        self._output_scale: float = 0.0
+        self._post_window_soft_cap: int = 0
+        self._update_output_coefficients()
+        self._refresh_static_attributes()
+
+    @callback
+    def _update_output_coefficients(self) -> None:
+        """Precompute the output scaling that only changes with the configuration.
+
+        Must be called whenever max_valve_position or room_power_share change.
+        """
+        effective_share = max(0.0, min(2.0, self._room_power_share))
+        # PID output 0-100% -> valve 0-max, weighted by room_power_share
+        self._output_scale = self._max_valve_position * effective_share / 100.0
+        self._post_window_soft_cap = int(
+            (self._post_window_max_output_percent / 100.0) * self._max_valve_position
+        )
 
     def _get_config_value(self, key: str, config: dict[str, Any], default: Any) -> Any:
         """Get config value from config_entry.options or config.data with fallback to default.
@@ -433,6 +795,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                 if share > 2.0:
                     share = 2.0
                 self._room_power_share = share
+                self._update_output_coefficients()
 
                 # Migration: Wenn noch die alten, sehr aggressiven Standardwerte
                 # (Kp=20, Ki=0.01, Kd=500, Ka=0) aktiv sind, stelle einmalig
@@ -533,18 +896,24 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         except Exception:
             new_room_id = None
         self._room_id = new_room_id or self._room_id
-        self._room_key = self._room_id or self._temp_sensor
+        self._room_key = sys.intern(self._room_id or self._temp_sensor)
 
         # Register in room registry (grouped by external temp sensor or room_id).
         # This tracks which SonTRV climates share the same room and allows
         # shared PID state across multiple TRVs.
         rooms = self.hass.data.setdefault(DOMAIN, {}).setdefault("rooms", {})
-        room_entities = rooms.setdefault(self._room_key, [])
-        if self not in room_entities:
-            room_entities.append(self)
-        # First entity in list is the temporary "leader" which can be
-        # used later for coordinated room-level PID control.
-        self._is_room_leader = room_entities[0] is self
+        # Per room: entry_id -> climate (insertion ordered).
+        room_entities = rooms.setdefault(self._room_key, {})
+        room_entities[self._entry_id] = self
+        # First registered entity is the "leader" which computes the
+        # room-level PID for all climates in the room.
+        self._is_room_leader = next(iter(room_entities)) == self._entry_id
+        # Shared PID state of the room, resolved once (the room key is fixed
+        # for the lifetime of the entity).
+        self._room_pid_state = self._get_room_pid_state()
+
+        if self._room_logging_enabled:
+            self._acquire_room_log_writer()
         
         # Auto-discover weather entity if not configured
         if not self._outside_temp_sensor:
@@ -589,16 +958,13 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             )
             # Initial read
             outside_state = self.hass.states.get(self._outside_temp_sensor)
-            if outside_state and outside_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            if outside_state is not None:
                 try:
-                    if outside_state.domain == "weather":
-                        temp = outside_state.attributes.get("temperature")
-                        if temp is not None:
-                            self._outside_temperature = float(temp)
-                    else:
-                        self._outside_temperature = float(outside_state.state)
-                except ValueError:
-                    pass
+                    temp = _extract_outside_temp(outside_state)
+                except (ValueError, TypeError):
+                    temp = None
+                if temp is not None:
+                    self._outside_temperature = temp
 
         # Track valve entity
         self._remove_listeners.append(
@@ -609,6 +975,23 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             )
         )
 
+        # Track Z2M helper entities (number/select) being added or removed,
+        # so the cached entity-vs-MQTT choice stays correct.
+        self._remove_listeners.append(
+            async_track_state_change_event(
+                self.hass,
+                [
+                    self._sensor_select_entity,
+                    self._temp_input_entity,
+                    self._valve_opening_entity,
+                    self._valve_closing_entity,
+                    self._calibration_entity,
+                    self._position_entity,
+                ],
+                self._async_helper_entity_changed,
+            )
+        )
+
         # Track window/door sensors if configured
         if self._window_sensors:
             self._remove_listeners.append(
@@ -623,18 +1006,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         await self._async_schedule_next_update()
         
         # Wait for TRV entity to be available (MQTT/Z2M startup)
-        _LOGGER.info("%s: Waiting for TRV entity %s to be available...", self.name, self._valve_entity)
-        max_wait = 30  # seconds
-        wait_interval = 1
-        for i in range(max_wait):
-            trv_state = self.hass.states.get(self._valve_entity)
-            if trv_state and trv_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-                _LOGGER.info("%s: TRV entity available after %d seconds", self.name, i)
-                break
-            if i < max_wait - 1:
-                await asyncio.sleep(wait_interval)
-        else:
-            _LOGGER.warning("%s: TRV entity not available after %d seconds, proceeding anyway", self.name, max_wait)
+        await self._async_wait_for_trv()
         
         # Read initial TRV state (battery, temperature, valve position)
         await self._async_read_trv_state()
@@ -642,15 +1014,22 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # Initial temperature update
         await self._async_update_temp()
         
-        # Force initial temperature calibration sync
-        await self._async_sync_temperature_calibration()
-        
         # IMPORTANT: Set initial valve opening degree
         # Calculate based on current temperature difference
         initial_opening = self._calculate_desired_valve_opening()
         if initial_opening < 0:
             initial_opening = self._max_valve_position
-        await self._async_set_valve_opening(initial_opening)
+
+        # Initial calibration sync, valve opening and target temperature go to
+        # different TRV endpoints and do not depend on each other, so they are
+        # sent concurrently. Each helper handles its own errors.
+        initial_syncs = [
+            self._async_sync_temperature_calibration(),
+            self._async_set_valve_opening(initial_opening),
+        ]
+        if self._attr_target_temperature is not None:
+            initial_syncs.append(self._async_sync_target_temperature())
+        await asyncio.gather(*initial_syncs)
         _LOGGER.info(
             "%s: Set initial valve opening to %d%% (preset: %s, mode: %s)",
             self.name,
@@ -659,19 +1038,57 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             self._control_mode,
         )
         
-        # Sync target temperature to TRV
-        if self._attr_target_temperature is not None:
-            await self._async_sync_target_temperature()
-        
-        # Update attributes
+        # Update attributes. Home Assistant writes the state once this method
+        # returns, so no explicit write is needed here.
+        self._setup_complete = True
+        self._refresh_static_attributes()
         self._update_extra_attributes()
-        self.async_write_ha_state()
+
+    async def _async_wait_for_trv(self, timeout: float = 30.0) -> None:
+        """Wait until the TRV entity reports a usable state (MQTT/Z2M startup)."""
+        trv_state = self.hass.states.get(self._valve_entity)
+        if trv_state and trv_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+
+        _LOGGER.info("%s: Waiting for TRV entity %s to be available...", self.name, self._valve_entity)
+        available = asyncio.Event()
+
+        @callback
+        def _async_trv_changed(event) -> None:
+            new_state = event.data.get("new_state")
+            if new_state is not None and new_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+                available.set()
+
+        remove_listener = async_track_state_change_event(
+            self.hass, [self._valve_entity], _async_trv_changed
+        )
+        start = self.hass.loop.time()
+        try:
+            await asyncio.wait_for(available.wait(), timeout)
+            _LOGGER.info(
+                "%s: TRV entity available after %.1f seconds",
+                self.name,
+                self.hass.loop.time() - start,
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.warning(
+                "%s: TRV entity not available after %d seconds, proceeding anyway",
+                self.name,
+                timeout,
+            )
+        finally:
+            remove_listener()
 
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity will be removed."""
         if self._update_timer:
             self._update_timer()
             self._update_timer = None
+        if self._valve_state_write_pending is not None:
+            self._valve_state_write_pending()
+            self._valve_state_write_pending = None
+        if self._exercise_task is not None:
+            self._exercise_task.cancel()
 
         # Unregister from room registry
         domain_data = self.hass.data.get(DOMAIN)
@@ -679,8 +1096,8 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             rooms = domain_data.get("rooms")
             if rooms is not None:
                 room_entities = rooms.get(self._room_key)
-                if room_entities and self in room_entities:
-                    room_entities.remove(self)
+                if room_entities and room_entities.get(self._entry_id) is self:
+                    del room_entities[self._entry_id]
                     # If room is now empty, remove it from registry
                     if not room_entities:
                         rooms.pop(self._room_key, None)
@@ -689,38 +1106,30 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             remove_listener()
         self._remove_listeners.clear()
 
+        await self._async_release_room_log_writer()
+
     @callback
     async def _async_outside_sensor_changed(self, event) -> None:
         """Handle outside temperature sensor changes."""
         new_state = event.data.get("new_state")
-        if new_state is not None and new_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-            try:
-                # Handle weather entities vs sensors
-                if new_state.domain == "weather":
-                    # Try standard attributes first
-                    temp = new_state.attributes.get("temperature")
-                    
-                    # Fallback: Try 'current_temperature' (some integrations)
-                    if temp is None:
-                        temp = new_state.attributes.get("current_temperature")
-                        
-                    if temp is not None:
-                        self._outside_temperature = float(temp)
-                        _LOGGER.debug("%s: Updated outside temp from weather entity %s: %.1f°C", 
-                                    self.name, new_state.entity_id, self._outside_temperature)
-                    else:
-                        _LOGGER.warning("%s: Weather entity %s has no 'temperature' attribute", 
-                                      self.name, new_state.entity_id)
-                else:
-                    # Legacy sensor support
-                    self._outside_temperature = float(new_state.state)
-                    _LOGGER.debug("%s: Updated outside temp from sensor %s: %.1f°C", 
-                                self.name, new_state.entity_id, self._outside_temperature)
-                    
-                # Note: We don't trigger immediate control loop for outside temp changes
-                # as feed-forward is slow-reacting anyway.
-            except ValueError:
-                _LOGGER.warning("%s: Could not parse outside temperature from %s", self.name, new_state.entity_id)
+        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        try:
+            temp = _extract_outside_temp(new_state)
+        except (ValueError, TypeError):
+            _LOGGER.warning("%s: Could not parse outside temperature from %s", self.name, new_state.entity_id)
+            return
+        if temp is None:
+            _LOGGER.warning("%s: Outside temperature source %s has no temperature", 
+                          self.name, new_state.entity_id)
+            return
+
+        self._outside_temperature = temp
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s: Updated outside temp from %s: %.1f°C", 
+                        self.name, new_state.entity_id, temp)
+        # Note: We don't trigger immediate control loop for outside temp changes
+        # as feed-forward is slow-reacting anyway.
 
     @callback
     async def _async_sensor_changed(self, event) -> None:
@@ -758,17 +1167,10 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                     #    letzten WINDOW_DROP_WINDOW Sekunden deutlich gefallen ist
                     #    (bezogen auf das Maximum in diesem Fenster), werten wir
                     #    das ebenfalls als Fenster-/Tür-Öffnung.
-                    if self._temp_history and self._temp_time_history:
-                        now = dt_util.now()
-                        window_start = now - timedelta(seconds=WINDOW_DROP_WINDOW)
-                        recent_values: list[float] = []
-                        for value, ts in zip(self._temp_history, self._temp_time_history):
-                            if ts >= window_start:
-                                recent_values.append(value)
-                        if recent_values:
-                            recent_max = max(recent_values)
-                            if recent_max - new_temp >= self._window_drop_threshold:
-                                sudden_drop_detected = True
+                    if self._recent_max_window:
+                        recent_max = self._recent_max_window[0][1]
+                        if recent_max - new_temp >= self._window_drop_threshold:
+                            sudden_drop_detected = True
             except ValueError:
                 should_trigger_immediate = True # Fallback on error
         else:
@@ -782,6 +1184,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                 self._remember_pre_window_state()
             self._window_freeze_active = True
             self._window_freeze_start = now_ts
+            self._window_freeze_since_iso = now_ts.isoformat()
             # Merke die Temperatur direkt vor bzw. zum Zeitpunkt des Drops
             self._window_start_temp = self._attr_current_temperature
             self._window_min_temp = self._attr_current_temperature
@@ -795,8 +1198,6 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             if self._last_set_valve_opening != 0:
                 await self._async_set_valve_opening(0)
             self._active = False
-            self._update_extra_attributes()
-            self.async_write_ha_state()
         
         # Immediately sync temperature calibration when sensor changes (keep display updated)
         # Only if change is significant to reduce traffic
@@ -808,54 +1209,45 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                 self._update_timer() # Cancel existing timer
                 self._update_timer = None
                 
+            # Every exit of the control loop writes the state, so this path
+            # needs no extra write of its own.
             await self._async_control_heating()
         else:
             # Just update attributes without triggering control logic
-            self.async_write_ha_state()
-            
-        self._update_extra_attributes()
+            self._async_write_state()
 
     @callback
     async def _async_valve_changed(self, event) -> None:
         """Handle valve position changes."""
         new_state = event.data.get("new_state")
-        if new_state is not None and new_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-            try:
-                # Read valve position from SONOFF TRVZB attributes
-                # TRVZB reports position as 0-100 (0=closed, 100=open)
-                attributes = new_state.attributes
-                if "position" in attributes:
-                    self._valve_position = int(attributes["position"])
-                elif "valve_position" in attributes:
-                    self._valve_position = int(attributes["valve_position"])
-                
-                # Read battery and internal temperature
-                # Battery can be in '_battery' or 'battery' attribute (prefer _battery)
-                for battery_attr in ["_battery", "battery"]:
-                    if battery_attr in attributes and attributes[battery_attr] is not None:
-                        battery_value = attributes[battery_attr]
-                        # Handle both numeric and string values
-                        if isinstance(battery_value, (int, float)):
-                            self._trv_battery = battery_value
-                        elif isinstance(battery_value, str):
-                            try:
-                                self._trv_battery = float(battery_value.replace("%", "").strip())
-                            except ValueError:
-                                pass
-                        break
-                
-                for attr_name in ["local_temperature", "current_temperature", "temperature"]:
-                    if attr_name in attributes:
-                        try:
-                            self._trv_internal_temp = float(attributes[attr_name])
-                            break
-                        except (ValueError, TypeError):
-                            pass
-                            
-            except (ValueError, TypeError, KeyError):
-                pass
-        self._update_extra_attributes()
-        self.async_write_ha_state()
+        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        prev = (self._valve_position, self._trv_battery, self._trv_internal_temp)
+        # Read valve position from SONOFF TRVZB attributes
+        # TRVZB reports position as 0-100 (0=closed, 100=open)
+        attributes = new_state.attributes
+        if (position := _parse_valve_position(attributes)) is not None:
+            self._valve_position = position
+        # Battery can be in '_battery' or 'battery' attribute (prefer _battery)
+        if (battery := _parse_battery(attributes)) is not None:
+            self._trv_battery = battery
+        if (trv_temp := _parse_trv_temp(attributes)) is not None:
+            self._trv_internal_temp = trv_temp
+        # Periodic Zigbee reports often repeat the same values: nothing to write
+        if prev == (self._valve_position, self._trv_battery, self._trv_internal_temp):
+            return
+        # The TRVZB reports position, battery and temperature in quick
+        # succession; write the state once per burst instead of per report.
+        if self._valve_state_write_pending is None:
+            self._valve_state_write_pending = async_call_later(
+                self.hass, VALVE_STATE_DEBOUNCE, self._async_flush_valve_state
+            )
+
+    @callback
+    def _async_flush_valve_state(self, _now=None) -> None:
+        """Write the state after a burst of TRV attribute reports."""
+        self._valve_state_write_pending = None
+        self._async_write_state()
 
     async def _async_read_trv_state(self) -> None:
         """Read initial TRV state (battery, temperature, valve position)."""
@@ -863,41 +1255,20 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         if trv_state and trv_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
             attributes = trv_state.attributes
             
-            # Read battery (can be numeric or with % symbol)
-            # Prefer _battery over battery
-            for battery_attr in ["_battery", "battery"]:
-                if battery_attr in attributes and attributes[battery_attr] is not None:
-                    battery_value = attributes[battery_attr]
-                    # Handle both numeric and string values
-                    if isinstance(battery_value, (int, float)):
-                        self._trv_battery = battery_value
-                    elif isinstance(battery_value, str):
-                        # Remove % symbol if present
-                        try:
-                            self._trv_battery = float(battery_value.replace("%", "").strip())
-                        except ValueError:
-                            _LOGGER.warning("%s: Could not parse battery value: %s", self.name, battery_value)
-                            continue
-                    _LOGGER.info("%s: Initial battery level: %s%%", self.name, self._trv_battery)
-                    break
+            # Read battery (can be numeric or with % symbol, prefer _battery)
+            if (battery := _parse_battery(attributes)) is not None:
+                self._trv_battery = battery
+                _LOGGER.info("%s: Initial battery level: %s%%", self.name, battery)
             
             # Read TRV internal temperature
-            for attr_name in ["local_temperature", "current_temperature", "temperature"]:
-                if attr_name in attributes:
-                    try:
-                        self._trv_internal_temp = float(attributes[attr_name])
-                        _LOGGER.info("%s: Initial TRV temperature: %.1f°C", self.name, self._trv_internal_temp)
-                        break
-                    except (ValueError, TypeError):
-                        pass
+            if (trv_temp := _parse_trv_temp(attributes)) is not None:
+                self._trv_internal_temp = trv_temp
+                _LOGGER.info("%s: Initial TRV temperature: %.1f°C", self.name, trv_temp)
             
             # Read valve position
-            if "position" in attributes:
-                self._valve_position = int(attributes["position"])
-                _LOGGER.info("%s: Initial valve position: %d%%", self.name, self._valve_position)
-            elif "valve_position" in attributes:
-                self._valve_position = int(attributes["valve_position"])
-                _LOGGER.info("%s: Initial valve position: %d%%", self.name, self._valve_position)
+            if (position := _parse_valve_position(attributes)) is not None:
+                self._valve_position = position
+                _LOGGER.info("%s: Initial valve position: %d%%", self.name, position)
     
     async def _async_update_temp(self) -> None:
         """Update temperature from sensor."""
@@ -908,9 +1279,20 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                 self._attr_current_temperature = new_temp
                 
                 # Update temperature history for trend and window detection
-                now = dt_util.now()
+                # (the ring buffer drops the oldest reading by itself)
                 self._temp_history.append(new_temp)
-                self._temp_time_history.append(now)
+
+                # Running-Max für die Drop-Erkennung: kleinere (ältere) Werte
+                # hinten verwerfen, abgelaufene Werte vorne entfernen.
+                max_window = self._recent_max_window
+                while max_window and max_window[-1][1] <= new_temp:
+                    max_window.pop()
+                now = self.hass.loop.time()
+                max_window.append((now, new_temp))
+                window_start = now - WINDOW_DROP_WINDOW
+                while max_window[0][0] < window_start:
+                    max_window.popleft()
+
                 # Während eines Fenster-Freeze die minimale Temperatur
                 # nachführen, um später die "Erholung" bewerten zu können.
                 if self._window_freeze_active:
@@ -919,50 +1301,71 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                     else:
                         if new_temp < self._window_min_temp:
                             self._window_min_temp = new_temp
-                # Keep a reasonable history length (e.g. last 20 readings)
-                if len(self._temp_history) > 20:
-                    self._temp_history.pop(0)
-                    self._temp_time_history.pop(0)
                     
             except (ValueError, TypeError):
                 _LOGGER.warning("Unable to update temperature from %s", self._temp_sensor)
 
     async def _async_schedule_next_update(self) -> None:
         """Schedule the next update based on stability (Adaptive Polling)."""
-        if self._update_timer:
-            self._update_timer()
-            self._update_timer = None
-            
         # Determine Interval
-        # Default: 10 minutes (600s)
-        # Stable: 30 minutes (1800s)
+        # Default: min_valve_update_interval (10 minutes)
+        # Stable or heating off: heartbeat only (30 minutes)
         
         interval = self._min_valve_update_interval
         
+        if self._attr_hvac_mode == HVACMode.OFF and not self._is_exercising:
+            # Nothing to regulate: the TRV is off and every relevant input
+            # change (mode, target, sensor) triggers the loop on its own.
+            interval = CONTROL_HEARTBEAT_INTERVAL
         # Check for stability to relax interval
-        if (self._attr_current_temperature and self._attr_target_temperature and
+        elif (self._attr_current_temperature and self._attr_target_temperature and
             abs(self._attr_target_temperature - self._attr_current_temperature) < 0.2 and
             not self._is_exercising):
              # System is stable, relax polling
              # Only if we are in PID mode (steady state)
              if self._control_mode == CONTROL_MODE_PID:
-                 interval = 1800 # 30 mins
+                 interval = CONTROL_HEARTBEAT_INTERVAL
                  _LOGGER.debug("%s: System stable, relaxing update interval to %ds", self.name, interval)
         
+        # Timer mit gleichem Intervall und noch ausreichender Restlaufzeit
+        # behalten statt ihn abzubrechen und neu einzuplanen.
+        if (
+            self._update_timer is not None
+            and self._scheduled_interval == interval
+            and self._next_update_mono is not None
+            and self._next_update_mono - self.hass.loop.time() > interval / 2
+        ):
+            return
+        
+        if self._update_timer:
+            self._update_timer()
+            self._update_timer = None
+        
         next_update = dt_util.now() + timedelta(seconds=interval)
         self._next_update_time = next_update
+        self._next_update_iso = next_update.isoformat()
+        self._next_update_mono = self.hass.loop.time() + interval
+        self._scheduled_interval = interval
         
         self._update_timer = async_track_point_in_time(
             self.hass,
-            self._async_control_heating,
+            self._async_update_timer_fired,
             next_update,
         )
 
+    async def _async_update_timer_fired(self, now=None) -> None:
+        """Handle the adaptive polling timer and run the control loop."""
+        # The timer is spent once it fires, its unsub handle is stale now.
+        self._update_timer = None
+        self._scheduled_interval = None
+        await self._async_control_heating(now)
+
     async def _async_control_heating(self, now=None) -> None:
         """Control heating with hysteresis and inertia for underfloor heating."""
         # Block control if exercising
         if self._is_exercising:
             _LOGGER.debug("%s: Skipping control loop - Valve exercise in progress", self.name)
+            self._async_write_state()
             # Schedule next check
             await self._async_schedule_next_update()
             return
@@ -979,7 +1382,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                 # Beim Ende des Fenster-Events den Integrator entschärfen,
                 # aber nicht komplett löschen – wir skalieren den Vor-Fenster-
                 # Wert auf einen kleineren Anteil herunter.
-                state = self._get_room_pid_state()
+                state = self._room_pid_state
                 if self._pre_window_integral is not None:
                     reduced = self._pre_window_integral * 0.3
                     state.integral_error = reduced
@@ -994,8 +1397,8 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                 self._window_min_temp = None
 
                 # Soft-Phase nach Fensterende aktivieren
-                self._post_window_soft_mode_until = dt_util.now() + timedelta(
-                    seconds=self._post_window_soft_duration
+                self._post_window_soft_mode_until = (
+                    self.hass.loop.time() + self._post_window_soft_duration
                 )
             else:
                 _LOGGER.debug(
@@ -1021,44 +1424,19 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                         and self._last_set_valve_opening >= 0
                         else 0
                     )
-                    window_freeze = True
-                    post_window_soft = False
-
-                    # Aggregierten Sensorzustand bestimmen
-                    window_sensor_open = False
-                    if self._window_sensors:
-                        for entity_id in self._window_sensors:
-                            state_entity = self.hass.states.get(entity_id)
-                            if state_entity and state_entity.state not in (
-                                STATE_UNAVAILABLE,
-                                STATE_UNKNOWN,
-                            ):
-                                if str(state_entity.state).lower() == "on":
-                                    window_sensor_open = True
-                                    break
-                    window_sensor_scope = (
-                        self._window_sensor_scope if self._window_sensors else "none"
-                    )
-                    window_sensors_str = (
-                        ",".join(self._window_sensors) if self._window_sensors else ""
-                    )
 
-                    self.hass.async_add_executor_job(
-                        self._append_room_log_row,
+                    self._append_room_log_row(
                         now_ts,
                         error,
                         room_demand,
                         valve_opening,
                         current_temp,
                         target_temp,
-                        self._outside_temperature,
-                        window_freeze,
-                        window_sensor_open,
-                        window_sensor_scope,
-                        window_sensors_str,
-                        post_window_soft,
+                        window_freeze_active=True,
+                        post_window_soft_active=False,
                     )
 
+                self._async_write_state()
                 await self._async_schedule_next_update()
                 return
 
@@ -1069,7 +1447,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         if self._attr_hvac_mode == HVACMode.OFF:
             await self._async_set_trv_off()
             self._active = False
-            self.async_write_ha_state()
+            self._async_write_state()
             # Still schedule next update to check for mode changes
             await self._async_schedule_next_update()
             return
@@ -1085,10 +1463,10 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # Only update if actually different OR if enough time passed
         should_write = False
         
-        if self._last_valve_update is None:
+        if self._last_valve_update_mono is None:
             should_write = True
         else:
-            time_since_last = (dt_util.now() - self._last_valve_update).total_seconds()
+            time_since_last = self.hass.loop.time() - self._last_valve_update_mono
             if time_since_last >= self._min_valve_update_interval:
                 # Time criterion met, check if value changed
                 if desired_opening != self._last_set_valve_opening:
@@ -1107,8 +1485,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             await self._async_sync_target_temperature()
         
         self._active = desired_opening > 0
-        self._update_extra_attributes()
-        self.async_write_ha_state()
+        self._async_write_state()
         
         # Schedule next run
         await self._async_schedule_next_update()
@@ -1152,7 +1529,8 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         #    - Letzte Werte innerhalb der Stabilitätsbandbreite
         #    - und signifikant über dem bisher tiefsten Punkt
         if len(self._temp_history) >= 3 and self._window_min_temp is not None:
-            recent = self._temp_history[-3:]
+            history = self._temp_history
+            recent = (history[-3], history[-2], history[-1])
             if max(recent) - min(recent) <= self._window_stable_band:
                 last_temp = recent[-1]
                 # Aktualisiere window_min_temp mit allen bisherigen Werten
@@ -1183,7 +1561,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         else:
             self._pre_window_valve_opening = 0
 
-        state = self._get_room_pid_state()
+        state = self._room_pid_state
         self._pre_window_integral = state.integral_error
         # Eine neue Fenster-Phase startet – vorherige Soft-Phase verwerfen.
         self._post_window_soft_mode_until = None
@@ -1210,23 +1588,20 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # Determine targets according to scope
         domain_data = self.hass.data.get(DOMAIN, {})
         rooms = domain_data.get("rooms", {})
-        room_entities = rooms.get(self._room_key, []) or []
+        room_entities = rooms.get(self._room_key) or {}
         targets: list[SonClouTRVClimate] = []
 
         if self._window_sensor_scope == WINDOW_SCOPE_ALL:
             # Global scope: alle SonTRV-Klimas aus hass.data[DOMAIN] ansteuern
-            for key, value in domain_data.items():
-                if not isinstance(value, dict):
-                    continue
-                entities = value.get("entities")
-                if not entities:
-                    continue
-                for entity in entities:
-                    if isinstance(entity, SonClouTRVClimate):
-                        targets.append(entity)
+            # (Eintrags-Buckets haben einen "climate"-Slot, siehe __init__.py)
+            for value in domain_data.values():
+                if isinstance(value, dict) and (
+                    entity := value.get("climate")
+                ) is not None:
+                    targets.append(entity)
         else:
             # Lokaler Scope: alle Thermostate im gleichen Raum (gleiche room_id/room_key)
-            for entity in room_entities:
+            for entity in room_entities.values():
                 if isinstance(entity, SonClouTRVClimate):
                     targets.append(entity)
 
@@ -1256,6 +1631,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                 self._remember_pre_window_state()
                 self._window_freeze_active = True
                 self._window_freeze_start = dt_util.now()
+                self._window_freeze_since_iso = self._window_freeze_start.isoformat()
                 self._window_start_temp = self._attr_current_temperature
                 self._window_min_temp = self._attr_current_temperature
                 _LOGGER.info("%s: Window sensor open -> freezing valve control", self.name)
@@ -1264,8 +1640,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             if self._last_set_valve_opening != 0:
                 await self._async_set_valve_opening(0)
             self._active = False
-            self._update_extra_attributes()
-            self.async_write_ha_state()
+            self._async_write_state()
             return
 
         # Fenster sind wieder geschlossen
@@ -1276,7 +1651,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             # Integrator nicht komplett löschen, sondern auf einen Bruchteil
             # des Vor-Fenster-Werts setzen, damit der Raum sein "Gedächtnis"
             # behält, aber nicht übersteuert.
-            state = self._get_room_pid_state()
+            state = self._room_pid_state
             if self._pre_window_integral is not None:
                 reduced = self._pre_window_integral * 0.3
                 state.integral_error = reduced
@@ -1291,8 +1666,8 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             self._window_min_temp = None
 
             # Soft-Phase nach Fensterende aktivieren
-            self._post_window_soft_mode_until = dt_util.now() + timedelta(
-                seconds=self._post_window_soft_duration
+            self._post_window_soft_mode_until = (
+                self.hass.loop.time() + self._post_window_soft_duration
             )
 
             # Sofortige Neuberechnung anstoßen
@@ -1307,50 +1682,32 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             _LOGGER.debug("%s: Cannot sync temperature - external temperature is None", self.name)
             return
         
-        # Optimization: Only sync if temp changed significantly or enough time passed (e.g. 10 mins)
-        # to reduce Zigbee traffic
+        # Optimization: Only sync if temp changed significantly to reduce Zigbee traffic.
+        # Early-exit before any state lookups or service calls.
         current_temp = round(self._attr_current_temperature, 1)
-        now = dt_util.now()
-        
-        should_sync = False
-        if self._last_synced_temp is None:
-            should_sync = True
-        elif abs(current_temp - self._last_synced_temp) >= 0.1:
-            should_sync = True
-        # Force sync every 30 mins just in case
-        # Note: We rely on SCAN_INTERVAL (5 mins) for the loop, so this is just a counter-check
-        # Actually, let's just sync on change or every 30 mins.
-        # But we don't track last sync time here easily without adding another var.
-        # Let's rely on change.
-        
-        if not should_sync:
-             # _LOGGER.debug("%s: Skipping temp sync - change too small", self.name)
-             return
+        if (
+            self._last_synced_temp is not None
+            and abs(current_temp - self._last_synced_temp) < 0.1
+        ):
+            return
 
         try:
             # Read TRV state for monitoring (existing logic kept)
             trv_state = self.hass.states.get(self._valve_entity)
             if trv_state:
-                # Capture TRV internal temperature
-                for attr_name in ["local_temperature", "current_temperature", "temperature"]:
-                    temp = trv_state.attributes.get(attr_name)
-                    if temp is not None:
-                        self._trv_internal_temp = float(temp)
-                        break
-                
-                # Capture battery level (prefer '_battery' over 'battery')
-                self._trv_battery = trv_state.attributes.get("_battery") or trv_state.attributes.get("battery")
+                # Capture TRV internal temperature and battery level
+                if (trv_temp := _parse_trv_temp(trv_state.attributes)) is not None:
+                    self._trv_internal_temp = trv_temp
+                if (battery := _parse_battery(trv_state.attributes)) is not None:
+                    self._trv_battery = battery
             
             # Step 1: Set temperature_sensor_select to "external"
-            if self.hass.states.get(self._sensor_select_entity):
+            if self._has_entity(self._sensor_select_entity):
                 # Via entity
                 await self.hass.services.async_call(
                     "select",
                     "select_option",
-                    {
-                        "entity_id": self._sensor_select_entity,
-                        "option": "external",
-                    },
+                    self._sensor_select_call_data,
                     blocking=False,
                 )
             else:
@@ -1358,15 +1715,12 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                 await self.hass.services.async_call(
                     "mqtt",
                     "publish",
-                    {
-                        "topic": self._mqtt_topic_sensor_select,
-                        "payload": "external",
-                    },
+                    self._sensor_select_mqtt_data,
                     blocking=False,
                 )
             
             # Step 2: Write external temperature value to external_temperature_input
-            if self.hass.states.get(self._temp_input_entity):
+            if self._has_entity(self._temp_input_entity):
                 # Via entity
                 await self.hass.services.async_call(
                     "number",
@@ -1407,61 +1761,108 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
 
     def _should_update_valve_opening(self) -> bool:
         """Check if we should update valve opening (apply inertia)."""
-        if self._last_valve_update is None:
+        if self._last_valve_update_mono is None:
             return True
         
-        time_since_last_update = (dt_util.now() - self._last_valve_update).total_seconds()
+        time_since_last_update = self.hass.loop.time() - self._last_valve_update_mono
         return time_since_last_update >= self._min_valve_update_interval
     
+    def _has_entity(self, entity_id: str) -> bool:
+        """Return True if the helper entity exists (use its service, else MQTT).
+
+        The result is cached per entity until the entity is added to or
+        removed from the state machine (see _async_helper_entity_changed).
+        """
+        present = self._entity_transport.get(entity_id)
+        if present is None:
+            present = self.hass.states.get(entity_id) is not None
+            self._entity_transport[entity_id] = present
+        return present
+
+    @callback
+    def _async_helper_entity_changed(self, event) -> None:
+        """Drop the cached transport choice when a helper entity appears or vanishes."""
+        if event.data.get("old_state") is None or event.data.get("new_state") is None:
+            self._entity_transport.pop(event.data["entity_id"], None)
+
     def _get_room_pid_state(self) -> RoomPIDState:
         """Return (and create if needed) the shared RoomPIDState for this room.
 
         The key is the logical room identifier (room_id or external temp sensor),
         so mehrere Thermostate im gleichen Raum teilen sich denselben PID-Zustand.
         """
-        domain_data = self.hass.data.setdefault(DOMAIN, {})
-        room_states = domain_data.setdefault("room_states", {})
+        room_states = self.hass.data[DOMAIN]["room_states"]
         state = room_states.get(self._room_key)
         if state is None:
-            state = RoomPIDState()
-            room_states[self._room_key] = state
+            state = room_states[self._room_key] = RoomPIDState()
         return state
 
-    def _calculate_desired_valve_opening(self) -> int:
-        """Calculate desired valve opening based on temperature difference (PID).
+    @property
+    def room_demand_reuse_window(self) -> int:
+        """Seconds the room output computed by this climate stays valid for others.
 
-        The PID state (integral, previous error, last_calc_time) is shared per
-        room (i.e. per external temperature sensor). This means multiple SonTRV
-        climates in the same room learn together instead of independently.
+        This is the current polling interval: the next control run recomputes it.
         """
-        if self._attr_current_temperature is None or self._attr_target_temperature is None:
-            return 0
-        
-        # Check if valve is disabled
-        if self._max_valve_position == 0:
-            return 0
-            
-        current_temp = self._attr_current_temperature
-        target_temp = self._attr_target_temperature
-        
-        # Error = Target - Current (Positive when cold/needs heat)
-        error = target_temp - current_temp
+        return self._scheduled_interval or self._min_valve_update_interval
 
-        # Only "learn" (update integral etc.) when heating is actually enabled.
-        # Otherwise summer/off-periods would distort the shared room PID state.
-        heating_on = self._attr_hvac_mode == HVACMode.HEAT
-        
-        # Get shared room PID state
-        state = self._get_room_pid_state()
-        
-        # PID Time Calculation
-        now = dt_util.now()
-        if state.last_calc_time is None:
-            state.last_calc_time = now
+    def _can_reuse_room_demand(self, state: RoomPIDState, target_temp: float) -> bool:
+        """Return True if this climate may reuse the room output of another climate.
+
+        The output must come from another climate of the room that is heating
+        and have been computed for the same target temperature. It is valid
+        within the same control tick (ROOM_PID_TICK), and for non-leaders also
+        until the leader's current polling interval has run out.
+        """
+        if state.last_calc_mono is None or state.last_target != target_temp:
+            return False
+        if state.last_calc_entity is None or state.last_calc_entity == self.entity_id:
+            return False
+        room_entities = self.hass.data[DOMAIN]["rooms"].get(self._room_key) or {}
+        producer = next(
+            (
+                climate
+                for climate in room_entities.values()
+                if climate.entity_id == state.last_calc_entity
+            ),
+            None,
+        )
+        if producer is None or producer.hvac_mode != HVACMode.HEAT:
+            return False
+        age = self.hass.loop.time() - state.last_calc_mono
+        if age < ROOM_PID_TICK:
+            return True
+        if self._is_room_leader or producer is not next(iter(room_entities.values())):
+            return False
+        return age < producer.room_demand_reuse_window
+
+    @staticmethod
+    def _compute_room_demand(
+        state: RoomPIDState,
+        now_mono: float,
+        error: float,
+        current_temp: float,
+        target_temp: float,
+        heating_on: bool,
+        kp: float,
+        ki: float,
+        kd: float,
+        ka: float,
+        hysteresis: float,
+        outside_temp: float | None,
+    ) -> float:
+        """Run the shared room PID and return the room heating demand in percent.
+
+        Pure function of its arguments: the caller reads the gains and inputs
+        from the entity once, so the PID math only works on locals. Updates the
+        shared RoomPIDState (integral, previous error, terms and last output)
+        in place.
+        """
+        # PID Time Calculation (monotone Loop-Zeit)
+        if state.last_calc_mono is None:
             dt = 0.0
         else:
-            dt = (now - state.last_calc_time).total_seconds()
-            state.last_calc_time = now
+            dt = now_mono - state.last_calc_mono
+        state.last_calc_mono = now_mono
 
         # Update long-term average absolute error for adaptive Ki scaling.
         # Wir verwenden einen exponentiell geglätteten Mittelwert mit einer
@@ -1481,17 +1882,9 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # damit der Regler kräftiger heizt. Nach oben (Raum zu warm) bleiben wir konservativ,
         # um Überschwingen zu vermeiden.
         abs_error = abs(error)
-        gain_scale = 1.0
-        if abs_error > 1.8:
-            gain_scale = 2.0
-        elif abs_error > 1.2:
-            gain_scale = 1.7
-        elif abs_error > 0.7:
-            gain_scale = 1.4
-        elif abs_error > 0.3:
-            gain_scale = 1.2
-
-        effective_kp = self._kp * gain_scale
+        gain_scale = GAIN_SCALE_VALUES[bisect.bisect_left(GAIN_SCALE_THRESHOLDS, abs_error)]
+
+        effective_kp = kp * gain_scale
 
         # Wenn der Raum schon zu warm ist (error < 0), leicht reduzierte Verstärkung,
         # damit wir nicht unnötig aggressiv nach unten regeln.
@@ -1509,14 +1902,14 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # Abweichung vom Soll hat (state.avg_error hoch), wird der I-Anteil
         # automatisch verstärkt. Damit "lernt" der Regler pro Raum ohne, dass
         # Kp/Ki manuell nachgestellt werden müssen.
-        base_ki = self._ki
+        base_ki = ki
         effective_ki = base_ki
         if heating_on and base_ki > 0:
-            avg_err = getattr(state, "avg_error", 0.0)
-            if avg_err > self._hysteresis:
+            avg_err = state.avg_error
+            if avg_err > hysteresis:
                 # Skala: ab Hysterese aufwärts. Pro weitere 0.3 K Dauerfehler
                 # erhöhen wir Ki um ca. 1x, bis max. 4x.
-                scale = 1.0 + max(0.0, (avg_err - self._hysteresis) / 0.3)
+                scale = 1.0 + max(0.0, (avg_err - hysteresis) / 0.3)
                 if scale > 4.0:
                     scale = 4.0
                 effective_ki = base_ki * scale
@@ -1531,7 +1924,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             #   sowie bei zu warmem Raum (error <= 0) bauen wir den Integrator ab.
             # - |error| > 1.0 K: Aufheiz-/Abkühlphase, hier soll hauptsächlich P arbeiten und
             #   der I-Anteil langsam in Richtung 0 "auslaufen" (Leak), statt eingefroren zu bleiben.
-            if abs_err < self._hysteresis:
+            if abs_err < hysteresis:
                 # Langsames Zurückfahren des Integrals in Richtung 0
                 state.integral_error *= 0.9
             elif abs_err <= 1.0:
@@ -1567,39 +1960,13 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             i_term = effective_ki * state.integral_error
             
         # 3. Derivative Term (Damping)
-        # Optimization: Calculate derivative based on input (Temperature) instead of Error
-        # to avoid "Derivative Kick" when target temperature changes.
-        # D = - Kd * (dInput / dt)
+        # Derivative on measurement: D = -Kd * (dCurrent / dt). Unlike the error
+        # derivative this has no "derivative kick" when the target changes.
         d_term = 0.0
-        if dt > 0:
-            # We want change in Temperature, not Error.
-            # Error = Target - Current
-            # If Target is constant: dError = - dCurrent
-            # So dError/dt = - (Current - Prev_Current) / dt
-            
-            # Using error difference (Standard PID)
-            # d_error = (error - state.prev_error) / dt
-            # d_term = self._kd * d_error
-            
-            # Using input difference (Derivative on Measurement)
-            # Requires storing previous input (temperature)
-            if self._last_temp_change is not None and self._attr_current_temperature is not None:
-                 # Note: self._last_temp_change is actually a timestamp in this class, not the value.
-                 # We need previous temperature value.
-                 # Let's derive it from prev_error if target hasn't changed? 
-                 # Too complex. Let's just use (error - prev_error) but suppress if target changed?
-                 pass
-            
-            # Simple fix for now: standard derivative but with small dt protection
-            if dt > 1.0: # Only calculate D if at least 1 second passed to avoid noise
-                 d_error = (error - state.prev_error) / dt
-                 d_term = self._kd * d_error
-                 
-                 # Suppress huge spikes (Derivative Kick protection)
-                 # If D term is huge (> 100%), it's likely a setpoint change.
-                 if abs(d_term) > 100:
-                     _LOGGER.debug("%s: D-Term spike detected (%.1f), suppressing", self.name, d_term)
-                     d_term = 0.0
+        # Only calculate D if at least 1 second passed to avoid noise
+        if dt > 1.0 and state.prev_temp is not None:
+            d_term = -kd * (current_temp - state.prev_temp) / dt
+        state.prev_temp = current_temp
 
         # Wenn der Fehler das Vorzeichen wechselt (z.B. von zu kalt nach zu warm),
         # Integral zurücksetzen, damit kein Nachschwingen durch aufgelaufenen I-Anteil entsteht.
@@ -1611,25 +1978,21 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # FF = (Target - Outside) * Ka
         # Only if Ka > 0 and outside temp is available
         ff_term = 0.0
-        if self._ka > 0 and self._outside_temperature is not None:
+        if ka > 0 and outside_temp is not None:
             # Delta between desired room temp and outside
             # The colder outside, the higher this delta -> More heating
-            outside_delta = target_temp - self._outside_temperature
+            outside_delta = target_temp - outside_temp
             
             # Simple linear model: Ka % per degree difference
             # E.g. Ka = 0.5, Target=21, Outside=0 -> Delta=21 -> FF = 10.5%
             # If Outside=15 -> Delta=6 -> FF = 3%
             if outside_delta > 0:
-                ff_term = self._ka * outside_delta
+                ff_term = ka * outside_delta
                 
-        # Store terms for debugging (entity-local mirrors of shared room state)
-        self._integral_error = state.integral_error
-        self._prev_error = state.prev_error
-        self._last_calc_time = state.last_calc_time
-        self._last_p = p_term
-        self._last_i = i_term
-        self._last_d = d_term
-        self._last_ff = ff_term
+        state.last_p = p_term
+        state.last_i = i_term
+        state.last_d = d_term
+        state.last_ff = ff_term
         
         # Total Output (Percent)
         raw_output = p_term + i_term + d_term + ff_term
@@ -1639,22 +2002,85 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # Store the *room-level* demand in the shared state so that dedicated
         # room debug sensors can expose this without re-implementing PID logic.
         state.last_output = desired_percent
+        state.last_target = target_temp
+        return desired_percent
+
+    def _calculate_desired_valve_opening(self) -> int:
+        """Calculate desired valve opening based on temperature difference (PID).
+
+        The PID state (integral, previous error, last_calc_time) is shared per
+        room (i.e. per external temperature sensor). This means multiple SonTRV
+        climates in the same room learn together instead of independently.
+        """
+        if self._attr_current_temperature is None or self._attr_target_temperature is None:
+            return 0
+        
+        # Check if valve is disabled
+        if self._max_valve_position == 0:
+            return 0
+            
+        current_temp = self._attr_current_temperature
+        target_temp = self._attr_target_temperature
+        
+        # Error = Target - Current (Positive when cold/needs heat)
+        error = target_temp - current_temp
+
+        # Only "learn" (update integral etc.) when heating is actually enabled.
+        # Otherwise summer/off-periods would distort the shared room PID state.
+        heating_on = self._attr_hvac_mode == HVACMode.HEAT
+        
+        # Get shared room PID state
+        state = self._room_pid_state
+
+        # Der PID wird nur einmal pro Raum gerechnet: der Raum-Bedarf eines
+        # anderen, heizenden Thermostats mit demselben Sollwert wird im selben
+        # Tick übernommen, von Nicht-Leadern zusätzlich bis zum Ablauf des
+        # aktuellen Polling-Intervalls des Leaders. Sonst (z.B. Leader
+        # ausgeschaltet) rechnet das Thermostat selbst.
+        if self._can_reuse_room_demand(state, target_temp):
+            desired_percent = state.last_output
+        else:
+            desired_percent = self._compute_room_demand(
+                state,
+                self.hass.loop.time(),
+                error,
+                current_temp,
+                target_temp,
+                heating_on,
+                self._kp,
+                self._ki,
+                self._kd,
+                self._ka,
+                self._hysteresis,
+                self._outside_temperature,
+            )
+            state.last_calc_time = dt_util.now()
+            state.last_calc_entity = self.entity_id
+
+        # Store terms for debugging (entity-local mirrors of shared room state)
+        self._integral_error = state.integral_error
+        self._prev_error = state.prev_error
+        self._last_calc_time = state.last_calc_time
+        self._last_p = state.last_p
+        self._last_i = state.last_i
+        self._last_d = state.last_d
+        self._last_ff = state.last_ff
         
         # Scale to max_valve_position (e.g. if max is 80%, we map 0-100% PID to 0-80% Valve)
         # OR: clamp strictly to max_valve_position?
         # Usually: PID output 0-100% corresponds to valve 0-Max. Additionally we
         # apply the per-thermostat room_power_share so that mehrere Kreise im
         # gleichen Raum unterschiedlich stark gewichtet werden können.
-        effective_share = max(0.0, min(2.0, getattr(self, "_room_power_share", 1.0)))
-        final_desired = int((desired_percent / 100.0) * self._max_valve_position * effective_share)
+        final_desired = int(desired_percent * self._output_scale)
         if final_desired > self._max_valve_position:
             final_desired = self._max_valve_position
         if final_desired < 0:
             final_desired = 0
 
         # Soft-Phase nach Fensterende: Ausgang und Schrittweite begrenzen.
-        now_soft = dt_util.now()
-        if self._post_window_soft_mode_until is not None and now_soft < self._post_window_soft_mode_until:
+        now = dt_util.now()
+        now_mono = self.hass.loop.time()
+        if self._post_window_soft_mode_until is not None and now_mono < self._post_window_soft_mode_until:
             # 1) Maximaler Sprung relativ zum Vor-Fenster-Wert
             if self._pre_window_valve_opening is not None:
                 upper_limit = self._pre_window_valve_opening + self._post_window_max_step
@@ -1664,12 +2090,9 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                     final_desired = upper_limit
 
             # 2) Absolute Obergrenze bezogen auf max_valve_position
-            soft_cap = int(
-                (self._post_window_max_output_percent / 100.0) * self._max_valve_position
-            )
-            if final_desired > soft_cap:
-                final_desired = soft_cap
-        elif self._post_window_soft_mode_until is not None and now_soft >= self._post_window_soft_mode_until:
+            if final_desired > self._post_window_soft_cap:
+                final_desired = self._post_window_soft_cap
+        elif self._post_window_soft_mode_until is not None and now_mono >= self._post_window_soft_mode_until:
             # Soft-Phase ist abgelaufen – Marker zurücksetzen
             self._post_window_soft_mode_until = None
             self._pre_window_valve_opening = None
@@ -1679,75 +2102,69 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # - Wenn der Raum deutlich zu warm ist (error < -hysteresis), Ventil sicher schließen.
         # - Wenn der Raum deutlich zu kalt ist (error > hysteresis), mindestens minimal öffnen,
         #   auch wenn der P-Regler wegen Rundung sonst 0 liefern würde.
+        # (1 = minimale Öffnungseinheit)
         if error < -self._hysteresis:
             final_desired = 0
-        elif error > self._hysteresis and final_desired == 0 and self._max_valve_position > 0:
-            final_desired = 1  # minimale Öffnungseinheit
+        else:
+            final_desired = max(
+                final_desired,
+                int(error > self._hysteresis and self._max_valve_position > 0),
+            )
 
         # Optional: append a CSV log row for this room for later ML analysis.
         # We only log when heating is enabled so the dataset reflects periods
         # where the TRVs actually work against the building inertia.
         if self._room_logging_enabled and heating_on:
-            # Use the same timestamp "now" used for dt calculation
-            # Zusätzlich Fenster-/Sensorzustand erfassen
-            window_freeze = self._window_freeze_active
-            post_window_soft = (
-                self._post_window_soft_mode_until is not None
-                and dt_util.now() < self._post_window_soft_mode_until
-            )
-            window_sensor_open = False
-            if self._window_sensors:
-                for entity_id in self._window_sensors:
-                    state_entity = self.hass.states.get(entity_id)
-                    if state_entity and state_entity.state not in (
-                        STATE_UNAVAILABLE,
-                        STATE_UNKNOWN,
-                    ):
-                        if str(state_entity.state).lower() == "on":
-                            window_sensor_open = True
-                            break
-            window_sensor_scope = (
-                self._window_sensor_scope if self._window_sensors else "none"
-            )
-            window_sensors_str = ",".join(self._window_sensors) if self._window_sensors else ""
-
-            self.hass.async_add_executor_job(
-                self._append_room_log_row,
+            # Use the same timestamp "now" as the soft-window check
+            self._append_room_log_row(
                 now,
                 error,
                 desired_percent,
                 final_desired,
                 current_temp,
                 target_temp,
-                self._outside_temperature,
-                window_freeze,
-                window_sensor_open,
-                window_sensor_scope,
-                window_sensors_str,
-                post_window_soft,
+                window_freeze_active=self._window_freeze_active,
+                post_window_soft_active=(
+                    self._post_window_soft_mode_until is not None
+                    and now_mono < self._post_window_soft_mode_until
+                ),
             )
         
-        # Hysteresis / Minimum movement check (Deadband on OUTPUT, not just error)
-        # If we are comfortably close to target, stay put to save battery?
-        # Standard PID is continuous.
-        # But we have `_min_valve_update_interval` managing the battery.
-        # So we can be precise here.
-        
-        # Special case: If error is within hysteresis and we are close to 0, close it?
-        # Legacy behavior mimic:
-        if abs(error) < self._hysteresis and self._control_mode != CONTROL_MODE_PID:
-             # Legacy Proportional Mode behavior override
-             # If someone specifically selects "Proportional" or "Binary", we might want to respect that logic?
-             # But we merged logic. Let's trust PID.
-             pass
-             
-        _LOGGER.debug(
-            "%s: PID: Target=%.1f, Curr=%.1f, Err=%.2f, P=%.1f, I=%.1f, D=%.1f, Out=%.1f%%, Final=%d%%",
-            self.name, target_temp, current_temp, error, p_term, i_term, d_term, desired_percent, final_desired
-        )
+        # Skip building the argument tuple (and self.name) unless debug is on
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "%s: PID: Target=%.1f, Curr=%.1f, Err=%.2f, P=%.1f, I=%.1f, D=%.1f, Out=%.1f%%, Final=%d%%",
+                self.name, target_temp, current_temp, error, self._last_p, self._last_i, self._last_d, desired_percent, final_desired
+            )
         
         return final_desired
 
+    @callback
+    def _acquire_room_log_writer(self) -> None:
+        """Attach to the shared CSV writer for this climate's log file."""
+        writers = self.hass.data.setdefault(DOMAIN, {}).setdefault("room_log_writers", {})
+        writer = writers.get(self._room_log_path)
+        if writer is None:
+            writer = writers[self._room_log_path] = RoomLogWriter(self.hass, self._room_log_path)
+            writer.async_start()
+        writer.users += 1
+        self._room_log_writer = writer
+
+    async def _async_release_room_log_writer(self) -> None:
+        """Detach from the shared CSV writer and stop it if no longer used."""
+        writer = self._room_log_writer
+        if writer is None:
+            return
+        self._room_log_writer = None
+        writer.users -= 1
+        if writer.users > 0:
+            return
+        writers = self.hass.data.get(DOMAIN, {}).get("room_log_writers", {})
+        if writers.get(self._room_log_path) is writer:
+            writers.pop(self._room_log_path)
+        await writer.async_stop()
+
+    @callback
     def _append_room_log_row(
         self,
         timestamp,
@@ -1756,54 +2173,31 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         valve_opening: int,
         current_temp: float,
         target_temp: float,
-        outside_temp: float | None,
+        *,
         window_freeze_active: bool,
-        window_sensor_open: bool,
-        window_sensor_scope: str,
-        window_sensors: str,
         post_window_soft_active: bool,
     ) -> None:
-        """Append a single CSV row with room / valve state for offline analysis.
+        """Queue a single CSV row with room / valve state for offline analysis.
 
-        This runs in an executor thread to avoid blocking the event loop with
-        file I/O. The file is created on first use and a header row is written
-        once.
+        The row is assembled on the event loop and handed to the shared
+        RoomLogWriter, which appends it to the file from an executor thread.
+        Outside temperature and the aggregated window sensor state are read
+        here so both call sites log them identically.
         """
-        try:
-            os.makedirs(os.path.dirname(self._room_log_path), exist_ok=True)
-        except Exception:
-            # If directory creation fails (e.g. empty dirname), ignore and try file write
-            pass
-
-        header = [
-            "timestamp",
-            "room_key",
-            "climate_entity",
-            "room_temp",
-            "target_temp",
-            "error",
-            "room_demand_percent",
-            "valve_opening_percent",
-            "max_valve_position",
-            "outside_temp",
-            "outside_sensor",
-            "hvac_mode",
-            "hvac_action",
-            "kp",
-            "ki",
-            "kd",
-            "ka",
-            "pid_p",
-            "pid_i",
-            "pid_d",
-            "pid_ff",
-            "pid_integral_error",
-            "window_freeze_active",
-            "window_sensor_open",
-            "window_sensor_scope",
-            "window_sensors",
-            "post_window_soft_active",
-        ]
+        if self._room_log_writer is None:
+            return
+
+        # Aggregierten Fenstersensor-Zustand bestimmen
+        window_sensor_open = False
+        for entity_id in self._window_sensors:
+            state_entity = self.hass.states.get(entity_id)
+            if (
+                state_entity
+                and state_entity.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+                and str(state_entity.state).lower() == "on"
+            ):
+                window_sensor_open = True
+                break
 
         row = [
             timestamp.isoformat() if hasattr(timestamp, "isoformat") else str(timestamp),
@@ -1815,7 +2209,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             round(room_demand, 3),
             valve_opening,
             self._max_valve_position,
-            outside_temp,
+            self._outside_temperature,
             self._outside_temp_sensor,
             getattr(self, "_attr_hvac_mode", None),
             getattr(self, "_attr_hvac_action", None),
@@ -1830,21 +2224,43 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             self._integral_error,
             int(window_freeze_active),
             int(window_sensor_open),
-            window_sensor_scope,
-            window_sensors,
+            self._window_sensor_scope if self._window_sensors else "none",
+            ",".join(self._window_sensors),
             int(post_window_soft_active),
         ]
 
-        try:
-            file_exists = os.path.isfile(self._room_log_path)
-            with open(self._room_log_path, "a", newline="") as csvfile:
-                writer = csv.writer(csvfile)
-                if not file_exists:
-                    writer.writerow(header)
-                writer.writerow(row)
-        except Exception as err:  # pragma: no cover - defensive
-            _LOGGER.error("%s: Failed to append room log row: %s", self.name, err)
+        self._room_log_writer.async_enqueue(row)
     
+    async def _async_set_degree(
+        self, entity_id: str, mqtt_topic: str, value: int, label: str
+    ) -> None:
+        """Write one valve degree via its number entity, or via MQTT as fallback."""
+        if self._has_entity(entity_id):
+            # Preferred: keeps HA + Z2M in sync
+            await self.hass.services.async_call(
+                "number",
+                "set_value",
+                {
+                    "entity_id": entity_id,
+                    "value": value,
+                },
+                blocking=True,
+            )
+            target = entity_id
+        else:
+            await self.hass.services.async_call(
+                "mqtt",
+                "publish",
+                {
+                    "topic": mqtt_topic,
+                    "payload": _PERCENT_PAYLOADS[value],
+                },
+                blocking=True,
+            )
+            target = "MQTT"
+        if _LOGGER.isEnabledFor(logging.INFO):
+            _LOGGER.info("%s: Set %s to %d%% via %s", self.name, label, value, target)
+
     async def _async_set_valve_opening(self, valve_opening: int) -> None:
         """Set valve opening and closing degree on the TRV.
 
@@ -1859,87 +2275,60 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             valve_opening = max(0, min(100, int(valve_opening)))
             valve_closing = 100 - valve_opening
 
-            # Try via number entities first (preferred: keeps HA + Z2M in sync)
-            if self.hass.states.get(self._valve_opening_entity):
-                await self.hass.services.async_call(
-                    "number",
-                    "set_value",
-                    {
-                        "entity_id": self._valve_opening_entity,
-                        "value": valve_opening,
-                    },
-                    blocking=True,
-                )
-                _LOGGER.info(
-                    "%s: Set valve_opening_degree to %d%% via %s",
-                    self.name,
-                    valve_opening,
+            # Same value written recently: nothing to send
+            if (
+                valve_opening == self._last_set_valve_opening
+                and self._last_valve_update_mono is not None
+                and self.hass.loop.time() - self._last_valve_update_mono
+                < VALVE_RESEND_INTERVAL
+            ):
+                return
+
+            # Öffnungs- und Schließgrad sind unabhängig: beide gleichzeitig senden.
+            # valve_closing_degree wird immer als 100 - opening mitgeführt.
+            open_result, close_result = await asyncio.gather(
+                self._async_set_degree(
                     self._valve_opening_entity,
-                )
-            else:
-                # Fallback: MQTT publish for opening
-                await self.hass.services.async_call(
-                    "mqtt",
-                    "publish",
-                    {
-                        "topic": self._mqtt_topic_valve_open,
-                        "payload": str(valve_opening),
-                    },
-                    blocking=True,
-                )
-                _LOGGER.info(
-                    "%s: Set valve_opening_degree to %d%% via MQTT",
-                    self.name,
+                    self._mqtt_topic_valve_open,
                     valve_opening,
-                )
-
-            # Always try to keep valve_closing_degree in sync as 100 - opening
-            if self.hass.states.get(self._valve_closing_entity):
-                await self.hass.services.async_call(
-                    "number",
-                    "set_value",
-                    {
-                        "entity_id": self._valve_closing_entity,
-                        "value": valve_closing,
-                    },
-                    blocking=True,
-                )
-                _LOGGER.info(
-                    "%s: Set valve_closing_degree to %d%% via %s",
-                    self.name,
-                    valve_closing,
+                    "valve_opening_degree",
+                ),
+                self._async_set_degree(
                     self._valve_closing_entity,
-                )
-            else:
-                await self.hass.services.async_call(
-                    "mqtt",
-                    "publish",
-                    {
-                        "topic": self._mqtt_topic_valve_close,
-                        "payload": str(valve_closing),
-                    },
-                    blocking=True,
-                )
-                _LOGGER.info(
-                    "%s: Set valve_closing_degree to %d%% via MQTT",
-                    self.name,
+                    self._mqtt_topic_valve_close,
                     valve_closing,
+                    "valve_closing_degree",
+                ),
+                return_exceptions=True,
+            )
+            # CancelledError ist eine BaseException, keine Exception: nicht als
+            # Erfolg werten, sondern weiterreichen.
+            if isinstance(open_result, BaseException):
+                raise open_result
+            if isinstance(close_result, BaseException):
+                if not isinstance(close_result, Exception):
+                    raise close_result
+                _LOGGER.error(
+                    "%s: Error setting valve_closing_degree: %s", self.name, close_result
                 )
             
             # Track last set value and timestamp
             self._last_set_valve_opening = valve_opening
             self._last_valve_update = dt_util.now()
+            self._last_valve_update_iso = self._last_valve_update.isoformat()
+            self._last_valve_update_mono = self.hass.loop.time()
             self._valve_position = valve_opening
             
             # Update statistics
             self._valve_adjustments_count += 1
-            self._valve_position_history.append(valve_opening)
-            if len(self._valve_position_history) > 10:
-                self._valve_position_history.pop(0)
+            history = self._valve_position_history
+            if len(history) == VALVE_HISTORY_LENGTH:
+                self._valve_history_sum -= history[0]
+            history.append(valve_opening)
+            self._valve_history_sum += valve_opening
             
             # Force state update to ensure attributes are refreshed
-            self._update_extra_attributes()
-            self.async_write_ha_state()
+            self._async_write_state()
             
         except Exception as err:
             _LOGGER.error("%s: Error setting valve opening/closing degree: %s", self.name, err)
@@ -1969,7 +2358,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                     "entity_id": self._valve_entity,
                     "hvac_mode": HVACMode.OFF,
                 },
-                blocking=True,
+                blocking=False,
             )
         except Exception as err:
             _LOGGER.error("%s: Error turning off TRV: %s", self.name, err)
@@ -1978,7 +2367,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         """Limit the valve opening by setting position attribute in Zigbee2MQTT."""
         try:
             # Try to set position via number entity if available
-            if self.hass.states.get(self._position_entity):
+            if self._has_entity(self._position_entity):
                 await self.hass.services.async_call(
                     "number",
                     "set_value",
@@ -2001,7 +2390,9 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                     "publish",
                     {
                         "topic": self._mqtt_topic_position,
-                        "payload": str(self._max_valve_position),
+                        "payload": _PERCENT_PAYLOADS[
+                            max(0, min(100, self._max_valve_position))
+                        ],
                     },
                     blocking=True,
                 )
@@ -2013,6 +2404,8 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
                 )
             
             self._last_valve_update = dt_util.now()
+            self._last_valve_update_iso = self._last_valve_update.isoformat()
+            self._last_valve_update_mono = self.hass.loop.time()
             
         except Exception as err:
             _LOGGER.error(
@@ -2030,13 +2423,50 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             return HVACAction.HEATING
         return HVACAction.IDLE
 
-    def _update_extra_attributes(self) -> None:
-        """Update extra state attributes."""
-        attrs = {
-            ATTR_VALVE_POSITION: self._valve_position,
+    @callback
+    def _async_write_state(self) -> None:
+        """Refresh the extra attributes and write the entity state.
+
+        While async_added_to_hass is still running the write is skipped:
+        Home Assistant writes the state itself once setup has finished, so
+        intermediate writes from the setup helpers would only fire extra
+        state_changed events.
+        """
+        if not self._setup_complete:
+            return
+        attrs_changed = self._update_extra_attributes()
+        core_state = (
+            self._attr_hvac_mode,
+            self.hvac_action,
+            self._attr_current_temperature,
+            self._attr_target_temperature,
+            self._attr_preset_mode,
+        )
+        if not attrs_changed and core_state == self._last_written_state:
+            return
+        self._last_written_state = core_state
+        self.async_write_ha_state()
+
+    @callback
+    def _refresh_static_attributes(self) -> None:
+        """Rebuild the attributes that only change with the configuration."""
+        self._static_attrs = {
             ATTR_CONTROL_MODE: self._control_mode,
             ATTR_TIME_CONTROL: self._time_control_enabled,
-            ATTR_LAST_VALVE_UPDATE: self._last_valve_update.isoformat() if self._last_valve_update else None,
+            "window_drop_threshold": self._window_drop_threshold,
+            "window_stable_band": self._window_stable_band,
+            "window_max_freeze": self._window_max_freeze,
+        }
+
+    def _update_extra_attributes(self) -> bool:
+        """Update extra state attributes.
+
+        Returns True if the attributes differ from the ones currently set.
+        """
+        attrs = {
+            **self._static_attrs,
+            ATTR_VALVE_POSITION: self._valve_position,
+            ATTR_LAST_VALVE_UPDATE: self._last_valve_update_iso,
             ATTR_VALVE_ADJUSTMENTS: self._valve_adjustments_count,
             "hysteresis": self._hysteresis,
             "min_valve_update_interval": self._min_valve_update_interval,
@@ -2046,7 +2476,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             ATTR_PID_INTEGRAL: round(self._integral_error, 2),
             "pid_ff": round(self._last_ff, 1),
             "outside_temperature": self._outside_temperature,
-            "next_update": self._next_update_time.isoformat() if self._next_update_time else None,
+            "next_update": self._next_update_iso,
             "is_exercising": self._is_exercising,
         }
         
@@ -2069,7 +2499,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # Statistics
         if self._valve_position_history:
             attrs[ATTR_AVG_VALVE_POSITION] = round(
-                sum(self._valve_position_history) / len(self._valve_position_history), 1
+                self._valve_history_sum / len(self._valve_position_history), 1
             )
         
         if len(self._temp_history) >= 2:
@@ -2079,16 +2509,14 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
 
         # Window / sudden drop info
         attrs["window_open"] = self._window_freeze_active
-        if self._window_freeze_start is not None:
-            attrs["window_freeze_since"] = self._window_freeze_start.isoformat()
-        else:
-            attrs["window_freeze_since"] = None
-        attrs["window_drop_threshold"] = self._window_drop_threshold
-        attrs["window_stable_band"] = self._window_stable_band
-        attrs["window_max_freeze"] = self._window_max_freeze
+        attrs["window_freeze_since"] = self._window_freeze_since_iso
         
+        if attrs == self._attr_extra_state_attributes:
+            return False
         self._attr_extra_state_attributes = attrs
-        _LOGGER.debug("%s: Updated extra_state_attributes = %s", self.name, attrs)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s: Updated extra_state_attributes = %s", self.name, attrs)
+        return True
 
     async def async_set_temperature(self, **kwargs) -> None:
         """Set new target temperature - sync to original TRV."""
@@ -2097,7 +2525,29 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         
         self._attr_target_temperature = temperature
         
-        # Write temperature directly to original TRV
+        # ✅ WICHTIG: Inertia-Timer zurücksetzen damit Steuerung sofort greift
+        self._last_valve_update = None
+        self._last_valve_update_iso = None
+        self._last_valve_update_mono = None
+        
+        self._preload_integrator(temperature)
+        
+        # ✅ WICHTIG: Kontrolllogik neu ausführen mit neuer Zieltemperatur
+        # Trigger immediate update via timer cancel
+        if self._update_timer:
+            self._update_timer()
+            self._update_timer = None
+        
+        # Zieltemperatur an das TRV senden und parallel neu regeln
+        await asyncio.gather(
+            self._async_write_target_to_trv(temperature),
+            self._async_control_heating(),
+        )
+        
+        self._async_write_state()
+
+    async def _async_write_target_to_trv(self, temperature: float) -> None:
+        """Write the target temperature directly to the original TRV."""
         try:
             await self.hass.services.async_call(
                 "climate",
@@ -2116,46 +2566,40 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             )
         except Exception as err:
             _LOGGER.error("Error syncing temperature to TRV: %s", err)
-        
-        # ✅ WICHTIG: Inertia-Timer zurücksetzen damit Steuerung sofort greift
-        self._last_valve_update = None
-        
-        # Optimization: Integrator Preloading (Smart Start)
-        # If we raise target temp significantly (> 1°C) and I-term is low/zero,
-        # preload it to give a head start. Assume we need at least 20% valve for heating.
-        if self._attr_current_temperature:
-            diff = temperature - self._attr_current_temperature
-            if diff > 1.0 and self._control_mode == CONTROL_MODE_PID:
-                # Calculate required I-sum for 20% output: 20 = Ki * I_sum -> I_sum = 20 / Ki
-                # Only preload if current integral is smaller than this
-                if self._ki > 0:
-                    preload_target = 20.0 / self._ki
-                    if self._integral_error < preload_target:
-                        # Don't jump fully, but boost significantly towards it
-                        self._integral_error = preload_target
-                        _LOGGER.info("%s: Smart Start - Preloaded PID Integrator to %.1f (Boost)", self.name, self._integral_error)
-        
-        # ✅ WICHTIG: Kontrolllogik neu ausführen mit neuer Zieltemperatur
-        # Trigger immediate update via timer cancel
-        if self._update_timer:
-            self._update_timer()
-            self._update_timer = None
-            
-        await self._async_control_heating()
-        
-        self._update_extra_attributes()
-        self.async_write_ha_state()
+
+    @callback
+    def _preload_integrator(self, temperature: float) -> None:
+        """Integrator Preloading (Smart Start) when the target is raised a lot.
+
+        If we raise target temp significantly (> 1°C) and I-term is low/zero,
+        preload it to give a head start. Assume we need at least 20% valve for
+        heating. The shared room state is updated, since the PID reads the
+        integral from there.
+        """
+        if not self._attr_current_temperature:
+            return
+        diff = temperature - self._attr_current_temperature
+        if diff <= 1.0 or self._control_mode != CONTROL_MODE_PID or self._ki <= 0:
+            return
+        # Calculate required I-sum for 20% output: 20 = Ki * I_sum -> I_sum = 20 / Ki
+        # Only preload if current integral is smaller than this
+        preload_target = 20.0 / self._ki
+        state = self._room_pid_state
+        if state is not None and state.integral_error < preload_target:
+            # Don't jump fully, but boost significantly towards it
+            state.integral_error = preload_target
+            self._integral_error = preload_target
+            _LOGGER.info("%s: Smart Start - Preloaded PID Integrator to %.1f (Boost)", self.name, preload_target)
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
-        if hvac_mode not in self._attr_hvac_modes:
+        if hvac_mode not in HVAC_MODES:
             _LOGGER.warning("Unsupported hvac_mode: %s", hvac_mode)
             return
         
         self._attr_hvac_mode = hvac_mode
         await self._async_control_heating()
-        self._update_extra_attributes()
-        self.async_write_ha_state()
+        self._async_write_state()
     
     async def async_calibrate_valve(self) -> None:
         """Calibrate the TRV valve (full open/close cycle)."""
@@ -2163,7 +2607,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             _LOGGER.info("%s: Starting valve calibration", self.name)
             
             # Try via select entity (if available)
-            if self.hass.states.get(self._calibration_entity):
+            if self._has_entity(self._calibration_entity):
                 # Some TRVs have a calibration select option
                 await self.hass.services.async_call(
                     "select",
@@ -2191,6 +2635,16 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         except Exception as err:
             _LOGGER.error("%s: Error during valve calibration: %s", self.name, err)
 
+    async def async_set_control_mode(self, control_mode: str) -> None:
+        """Switch the control mode at runtime (called by the select entity)."""
+        self._control_mode = control_mode
+        self._refresh_static_attributes()
+        _LOGGER.info("%s: Control mode set to %s", self.name, control_mode)
+        # Run the control loop once so the new mode (and its update interval)
+        # takes effect right away
+        await self._async_control_heating()
+        self._async_write_state()
+
     async def async_trigger_valve_exercise(self) -> None:
         """Run the anti-calcification exercise (5 min open, 5 min closed)."""
         _LOGGER.info("%s: Starting anti-calcification valve exercise", self.name)
@@ -2201,75 +2655,52 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             
         self._is_exercising = True
         
+        # Save current valve position and preset mode
+        original_position = self._valve_position
+        original_preset = self._attr_preset_mode
+        
+        _LOGGER.info("%s: Saved current state - Position: %d%%, Preset: %s", 
+                    self.name, original_position, original_preset)
+        
+        # Run the steps in the background (non-blocking)
+        self._exercise_task = self.hass.async_create_background_task(
+            self._async_run_valve_exercise(original_position, original_preset),
+            f"{DOMAIN} valve exercise {self._entry_id}",
+        )
+
+    async def _async_run_valve_exercise(
+        self, original_position: int, original_preset: str | None
+    ) -> None:
+        """Open fully, close fully, then restore the original position."""
         try:
-            # Save current valve position and preset mode
-            original_position = self._valve_position
-            original_preset = self._attr_preset_mode
-            
-            _LOGGER.info("%s: Saved current state - Position: %d%%, Preset: %s", 
-                        self.name, original_position, original_preset)
-            
             # Step 1: Fully open (100%) for 5 minutes
             await self._async_set_valve_opening(100)
-            _LOGGER.info("%s: Valve fully opened (100%%), scheduled close in 5 minutes", self.name)
+            _LOGGER.info("%s: Valve fully opened (100%%), closing in 5 minutes", self.name)
+            await asyncio.sleep(VALVE_EXERCISE_STEP_DURATION)
             
-            # Schedule step 2 after 5 minutes (non-blocking)
-            from homeassistant.helpers.event import async_call_later
-            async_call_later(
-                self.hass,
-                300,  # 5 minutes
-                self._async_exercise_step_2,
-                (original_position, original_preset),
-            )
-            
-        except Exception as err:
-            _LOGGER.error("%s: Error during valve exercise: %s", self.name, err)
-            self._is_exercising = False
-
-    async def _async_exercise_step_2(self, args) -> None:
-        """Step 2: Fully close valve for 5 minutes."""
-        original_position, original_preset = args
-        try:
             # Step 2: Fully close (0%) for 5 minutes
             await self._async_set_valve_opening(0)
-            _LOGGER.info("%s: Valve fully closed (0%%), scheduled restore in 5 minutes", self.name)
-            
-            # Schedule step 3 after 5 minutes (non-blocking)
-            from homeassistant.helpers.event import async_call_later
-            async_call_later(
-                self.hass,
-                300,  # 5 minutes
-                self._async_exercise_step_3,
-                (original_position, original_preset),
-            )
+            _LOGGER.info("%s: Valve fully closed (0%%), restoring in 5 minutes", self.name)
+            await asyncio.sleep(VALVE_EXERCISE_STEP_DURATION)
             
-        except Exception as err:
-            _LOGGER.error("%s: Error during valve exercise step 2: %s", self.name, err)
-            self._is_exercising = False
-
-    async def _async_exercise_step_3(self, args) -> None:
-        """Step 3: Restore original position and resume normal control."""
-        original_position, original_preset = args
-        try:
             # Step 3: Restore original position and trigger normal control
             await self._async_set_valve_opening(original_position)
             self._attr_preset_mode = original_preset
             _LOGGER.info("%s: Valve exercise complete - restored to %d%% (Preset: %s)", 
                        self.name, original_position, original_preset)
-            
-            # Reset exercising flag
-            self._is_exercising = False
-            
-            # Trigger normal heating control to resume
-            await self._async_schedule_next_update()
-            
         except Exception as err:
-            _LOGGER.error("%s: Error during valve exercise step 3: %s", self.name, err)
+            _LOGGER.error("%s: Error during valve exercise: %s", self.name, err)
+        finally:
+            # Reset exercising flag (also when cancelled on removal)
             self._is_exercising = False
+            self._exercise_task = None
+        
+        # Trigger normal heating control to resume
+        await self._async_schedule_next_update()
     
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode (valve opening step)."""
-        if preset_mode not in self._attr_preset_modes:
+        if preset_mode not in PRESET_MODES:
             _LOGGER.warning("Unsupported preset_mode: %s", preset_mode)
             return
         
@@ -2279,6 +2710,7 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
         # Update max valve position
         old_position = self._max_valve_position
         self._max_valve_position = VALVE_OPENING_STEPS.get(preset_mode, 80)
+        self._update_output_coefficients()
         
         _LOGGER.info(
             "%s: Preset mode changed from %s (%d%%) to %s (%d%%)",
@@ -2303,4 +2735,4 @@ class SonClouTRVClimate(ClimateEntity, RestoreEntity):
             )
         
         self._active = desired_opening > 0
-        self.async_write_ha_state()
+        self._async_write_state()
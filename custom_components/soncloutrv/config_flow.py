@@ -8,7 +8,7 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 import homeassistant.helpers.config_validation as cv
 
@@ -66,38 +66,77 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Selectors and validators shared by the user and options forms. They are
+# immutable, so they are built once at import instead of on every render.
+_TEMP_SENSOR_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(domain="sensor", device_class="temperature")
+)
+_OUTSIDE_TEMP_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(domain=["sensor", "weather"], device_class="temperature")
+)
+_WINDOW_SENSORS_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(
+        domain="binary_sensor",
+        device_class=["window", "door"],
+        multiple=True,
+    )
+)
+_WINDOW_SCOPE_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[
+            {"value": WINDOW_SCOPE_LOCAL, "label": "Nur dieses Thermostat"},
+            {"value": WINDOW_SCOPE_ALL, "label": "Alle SonTRV-Thermostate"},
+        ],
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
+)
+_ROOM_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=DEFAULT_ROOMS,
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
+)
+_VALVE_STEP_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[
+            {"value": "*", "label": "* Aus (0%)"},
+            {"value": "1", "label": "Stufe 1 (20%)"},
+            {"value": "2", "label": "Stufe 2 (40%)"},
+            {"value": "3", "label": "Stufe 3 (60%)"},
+            {"value": "4", "label": "Stufe 4 (80%)"},
+            {"value": "5", "label": "Stufe 5 (100%)"},
+        ],
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
+)
+_TEMPERATURE_RANGE = vol.All(vol.Coerce(float), vol.Range(min=5, max=35))
 
-def _filter_sonoff_trvzb_entities(hass: HomeAssistant) -> list[str]:
-    """Filter climate entities to only show SONOFF TRVZB devices."""
-    filtered_entities = []
-    
-    for entity_id in hass.states.async_entity_ids("climate"):
-        state = hass.states.get(entity_id)
-        if not state:
-            continue
-        
-        # Check if entity is from Zigbee2MQTT and is SONOFF TRVZB
-        # Zigbee2MQTT entities typically have specific attributes
-        attributes = state.attributes
-        
-        # Check for Zigbee2MQTT integration
-        if "via_device" in attributes or entity_id.startswith("climate.0x"):
-            # Check device model in friendly_name or other attributes
-            friendly_name = attributes.get("friendly_name", "")
-            model = attributes.get("model", "")
-            
-            # SONOFF TRVZB identification
-            if "TRVZB" in model or "trvzb" in friendly_name.lower() or "TRVZB" in friendly_name:
-                filtered_entities.append(entity_id)
-                continue
-            
-            # Alternative: Check for SONOFF manufacturer
-            if "sonoff" in friendly_name.lower() or "SONOFF" in str(attributes.get("manufacturer", "")):
-                # Additional check if it's a TRV (has position attribute)
-                if "position" in attributes or "valve" in friendly_name.lower():
-                    filtered_entities.append(entity_id)
-    
-    return filtered_entities
+# The user step has no entry-specific defaults: one schema for all renders
+_USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME, default=DEFAULT_NAME): cv.string,
+        vol.Required(CONF_VALVE_ENTITY): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="climate",
+                integration="mqtt",
+            )
+        ),
+        vol.Optional(CONF_ROOM_ID, default=DEFAULT_ROOMS[0]): _ROOM_SELECTOR,
+        vol.Required(CONF_TEMP_SENSOR): _TEMP_SENSOR_SELECTOR,
+        vol.Optional(CONF_OUTSIDE_TEMP_SENSOR): _OUTSIDE_TEMP_SELECTOR,
+        vol.Optional(CONF_WINDOW_SENSORS): _WINDOW_SENSORS_SELECTOR,
+        vol.Optional(
+            CONF_WINDOW_SENSOR_SCOPE,
+            default=WINDOW_SCOPE_LOCAL,
+        ): _WINDOW_SCOPE_SELECTOR,
+        vol.Optional(CONF_MIN_TEMP, default=DEFAULT_MIN_TEMP): _TEMPERATURE_RANGE,
+        vol.Optional(CONF_MAX_TEMP, default=DEFAULT_MAX_TEMP): _TEMPERATURE_RANGE,
+        vol.Optional(CONF_TARGET_TEMP, default=DEFAULT_TARGET_TEMP): _TEMPERATURE_RANGE,
+        vol.Optional(
+            CONF_VALVE_OPENING_STEP, default=DEFAULT_VALVE_OPENING_STEP
+        ): _VALVE_STEP_SELECTOR,
+    }
+)
 
 
 class SonClouTRVConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -135,78 +174,9 @@ class SonClouTRVConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     data=user_input,
                 )
 
-        # Get filtered SONOFF TRVZB entities
-        available_valves = _filter_sonoff_trvzb_entities(self.hass)
-        
-        # Build the configuration schema
-        data_schema = vol.Schema(
-            {
-                vol.Required(CONF_NAME, default=DEFAULT_NAME): cv.string,
-                vol.Required(CONF_VALVE_ENTITY): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="climate",
-                        integration="mqtt",
-                    )
-                ),
-                vol.Optional(CONF_ROOM_ID, default=DEFAULT_ROOMS[0]): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=DEFAULT_ROOMS,
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
-                vol.Required(CONF_TEMP_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain="sensor", device_class="temperature")
-                ),
-                vol.Optional(CONF_OUTSIDE_TEMP_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor", "weather"], device_class="temperature")
-                ),
-                vol.Optional(CONF_WINDOW_SENSORS): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="binary_sensor",
-                        device_class=["window", "door"],
-                        multiple=True,
-                    )
-                ),
-                vol.Optional(
-                    CONF_WINDOW_SENSOR_SCOPE,
-                    default=WINDOW_SCOPE_LOCAL,
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            {"value": WINDOW_SCOPE_LOCAL, "label": "Nur dieses Thermostat"},
-                            {"value": WINDOW_SCOPE_ALL, "label": "Alle SonTRV-Thermostate"},
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
-                vol.Optional(CONF_MIN_TEMP, default=DEFAULT_MIN_TEMP): vol.All(
-                    vol.Coerce(float), vol.Range(min=5, max=35)
-                ),
-                vol.Optional(CONF_MAX_TEMP, default=DEFAULT_MAX_TEMP): vol.All(
-                    vol.Coerce(float), vol.Range(min=5, max=35)
-                ),
-                vol.Optional(CONF_TARGET_TEMP, default=DEFAULT_TARGET_TEMP): vol.All(
-                    vol.Coerce(float), vol.Range(min=5, max=35)
-                ),
-                vol.Optional(CONF_VALVE_OPENING_STEP, default=DEFAULT_VALVE_OPENING_STEP): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            {"value": "*", "label": "* Aus (0%)"},
-                            {"value": "1", "label": "Stufe 1 (20%)"},
-                            {"value": "2", "label": "Stufe 2 (40%)"},
-                            {"value": "3", "label": "Stufe 3 (60%)"},
-                            {"value": "4", "label": "Stufe 4 (80%)"},
-                            {"value": "5", "label": "Stufe 5 (100%)"},
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
-            }
-        )
-
         return self.async_show_form(
             step_id="user",
-            data_schema=data_schema,
+            data_schema=_USER_SCHEMA,
             errors=errors,
         )
 
@@ -253,12 +223,7 @@ class SonClouTRVOptionsFlow(config_entries.OptionsFlow):
                         CONF_OUTSIDE_TEMP_SENSOR,
                         self.config_entry.data.get(CONF_WEATHER_ENTITY),
                     )},
-                ): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain=["sensor", "weather"],
-                        device_class="temperature",
-                    )
-                ),
+                ): _OUTSIDE_TEMP_SELECTOR,
                 # Erlaube das nachträgliche Ändern des externen Temperatursensors
                 vol.Optional(
                     CONF_TEMP_SENSOR,
@@ -266,12 +231,7 @@ class SonClouTRVOptionsFlow(config_entries.OptionsFlow):
                         CONF_TEMP_SENSOR,
                         self.config_entry.data.get(CONF_TEMP_SENSOR),
                     ),
-                ): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        device_class="temperature",
-                    )
-                ),
+                ): _TEMP_SENSOR_SELECTOR,
                 vol.Optional(
                     CONF_ROOM_LOGGING_ENABLED,
                     default=self.config_entry.options.get(
@@ -313,68 +273,37 @@ class SonClouTRVOptionsFlow(config_entries.OptionsFlow):
                         CONF_WINDOW_SENSORS,
                         self.config_entry.data.get(CONF_WINDOW_SENSORS, []),
                     ),
-                ): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="binary_sensor",
-                        device_class=["window", "door"],
-                        multiple=True,
-                    )
-                ),
+                ): _WINDOW_SENSORS_SELECTOR,
                 vol.Optional(
                     CONF_WINDOW_SENSOR_SCOPE,
                     default=self.config_entry.options.get(
                         CONF_WINDOW_SENSOR_SCOPE,
                         self.config_entry.data.get(CONF_WINDOW_SENSOR_SCOPE, WINDOW_SCOPE_LOCAL),
                     ),
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            {"value": WINDOW_SCOPE_LOCAL, "label": "Nur dieses Thermostat"},
-                            {"value": WINDOW_SCOPE_ALL, "label": "Alle SonTRV-Thermostate"},
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
+                ): _WINDOW_SCOPE_SELECTOR,
                 vol.Optional(
                     CONF_MIN_TEMP,
                     default=self.config_entry.data.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP),
-                ): vol.All(vol.Coerce(float), vol.Range(min=5, max=35)),
+                ): _TEMPERATURE_RANGE,
                 vol.Optional(
                     CONF_MAX_TEMP,
                     default=self.config_entry.data.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP),
-                ): vol.All(vol.Coerce(float), vol.Range(min=5, max=35)),
+                ): _TEMPERATURE_RANGE,
                 vol.Optional(
                     CONF_ROOM_ID,
                     default=self.config_entry.options.get(
                         CONF_ROOM_ID,
                         self.config_entry.data.get(CONF_ROOM_ID, DEFAULT_ROOMS[0]),
                     ),
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=DEFAULT_ROOMS,
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
+                ): _ROOM_SELECTOR,
                 vol.Optional(
                     CONF_TARGET_TEMP,
                     default=self.config_entry.data.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP),
-                ): vol.All(vol.Coerce(float), vol.Range(min=5, max=35)),
+                ): _TEMPERATURE_RANGE,
                 vol.Optional(
                     CONF_VALVE_OPENING_STEP,
                     default=self.config_entry.data.get(CONF_VALVE_OPENING_STEP, DEFAULT_VALVE_OPENING_STEP),
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            {"value": "*", "label": "* Aus (0%)"},
-                            {"value": "1", "label": "Stufe 1 (20%)"},
-                            {"value": "2", "label": "Stufe 2 (40%)"},
-                            {"value": "3", "label": "Stufe 3 (60%)"},
-                            {"value": "4", "label": "Stufe 4 (80%)"},
-                            {"value": "5", "label": "Stufe 5 (100%)"},
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
+                ): _VALVE_STEP_SELECTOR,
             }
         )
 
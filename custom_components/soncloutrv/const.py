@@ -1,8 +1,13 @@
 """Constants for the SonClouTRV integration."""
+from types import MappingProxyType
 
 DOMAIN = "soncloutrv"
 PLATFORMS = ["climate", "sensor", "number", "switch", "button", "select"]
 
+# Device registry information shared by all entities of an entry
+MANUFACTURER = "k2dp2k"
+MODEL = "Smart Thermostat Control"
+
 # Configuration keys
 CONF_VALVE_ENTITY = "valve_entity"
 CONF_TEMP_SENSOR = "temp_sensor"
@@ -53,14 +58,15 @@ CONTROL_MODE_PID = "pid"  # Renamed/Upgraded from proportional
 CONTROL_MODE_PROPORTIONAL = "proportional"
 
 # Valve opening steps (* = closed, then 5 levels in 20% increments)
-VALVE_OPENING_STEPS = {
+# Read-only view: shared by all platforms, must not be modified at runtime
+VALVE_OPENING_STEPS = MappingProxyType({
     "*": 0,   # Closed / Off
     "1": 20,
     "2": 40,
     "3": 60,
     "4": 80,
     "5": 100,
-}
+})
 
 # Preset modes
 PRESET_OFF = "*"      # 0% - Closed
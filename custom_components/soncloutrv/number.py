@@ -1,17 +1,23 @@
 """Number platform for SonClouTRV."""
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
 import logging
+from types import MappingProxyType
+from typing import Any
 
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 
 from .const import (
     DOMAIN,
+    MANUFACTURER,
+    MODEL,
     CONF_KP,
     CONF_KI,
     CONF_KD,
@@ -26,6 +32,137 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Delay before a slider change is persisted (seconds). Rapid successive changes
+# of the same setting are folded into one options update.
+PERSIST_DELAY = 1.0
+
+
+def _set_room_power_share(entity: Any, value: float) -> None:
+    """Apply the room power share (clamped to 0..2) and refresh the output scaling."""
+    try:
+        share = float(value)
+    except (TypeError, ValueError):
+        share = DEFAULT_ROOM_POWER_SHARE
+    # Clamp defensively
+    entity._room_power_share = max(0.0, min(2.0, share))
+    entity._update_output_coefficients()
+
+
+# Setting id -> function applying the slider value to the climate entity
+_SETTERS: dict[str, Callable[[Any, float], None]] = {
+    "hysteresis": lambda entity, value: setattr(entity, "_hysteresis", value),
+    # Convert minutes to seconds
+    "min_valve_update_interval": lambda entity, value: setattr(
+        entity, "_min_valve_update_interval", int(value * 60)
+    ),
+    CONF_KP: lambda entity, value: setattr(entity, "_kp", value),
+    CONF_KI: lambda entity, value: setattr(entity, "_ki", value),
+    CONF_KD: lambda entity, value: setattr(entity, "_kd", value),
+    CONF_KA: lambda entity, value: setattr(entity, "_ka", value),
+    CONF_ROOM_POWER_SHARE: _set_room_power_share,
+    "proportional_gain": lambda entity, value: setattr(entity, "_kp", value),  # Legacy
+}
+
+
+# Number settings: (setting_id, name, min, max, step, unit, icon, default)
+_NUMBER_SPECS: tuple[tuple[Any, ...], ...] = (
+    (
+        "hysteresis",
+        "Hysterese",
+        0.1,
+        2.0,
+        0.1,
+        "°C",
+        "mdi:thermometer-lines",
+        0.15,  # Default value (entspricht DEFAULT_HYSTERESIS)
+    ),
+    (
+        "min_valve_update_interval",
+        "Trägheit (Min. Update-Intervall)",
+        1,
+        60,
+        1,
+        UnitOfTime.MINUTES,
+        "mdi:timer-sand",
+        10,  # Default: 10 minutes
+    ),
+    (
+        CONF_KP,
+        "PID: P-Gain (Kp)",
+        1.0,
+        100.0,
+        1.0,
+        "%/°C",
+        "mdi:thermometer-lines",
+        DEFAULT_KP,
+    ),
+    (
+        CONF_KI,
+        "PID: I-Gain (Ki - Lernen)",
+        0.0,
+        0.5,
+        0.001,
+        "%/°C/s",
+        "mdi:chart-bell-curve-cumulative",
+        DEFAULT_KI,
+    ),
+    (
+        CONF_KD,
+        "PID: D-Gain (Kd - Dämpfung)",
+        0.0,
+        2000.0,
+        10.0,
+        "%/°C/s",
+        "mdi:speedometer-slow",
+        DEFAULT_KD,
+    ),
+    (
+        CONF_KA,
+        "Feed-Forward: Außen-Gain (Ka)",
+        0.0,
+        10.0,
+        0.1,
+        "%/°C",
+        "mdi:weather-cloudy-arrow-right",
+        DEFAULT_KA,
+    ),
+    (
+        CONF_ROOM_POWER_SHARE,
+        "Raum-Leistungsanteil",
+        0.1,
+        1.5,
+        0.05,
+        "",
+        "mdi:home-thermometer-outline",
+        DEFAULT_ROOM_POWER_SHARE,
+    ),
+)
+
+# Description attributes per setting id (one shared read-only mapping each)
+_DESCRIPTIONS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "hysteresis": MappingProxyType(
+        {"description": "Temperaturbereich, in dem das Ventil nicht verändert wird. Verhindert ständiges Schalten. Empfehlung: 0,15-0,5°C."}
+    ),
+    "min_valve_update_interval": MappingProxyType(
+        {"description": "Minimale Zeit zwischen Ventil-Anpassungen. Höhere Werte = träger. Empfehlung: 10-20 Min für Fußbodenheizung."}
+    ),
+    CONF_KP: MappingProxyType(
+        {"description": "Proportional-Anteil: Basis-Leistung basierend auf Temperaturdifferenz. Höher = aggressiver."}
+    ),
+    CONF_KI: MappingProxyType(
+        {"description": "Integral-Anteil: 'Lernt' den Wärmebedarf über die Zeit. Gleicht langfristige Abweichungen aus."}
+    ),
+    CONF_KD: MappingProxyType(
+        {"description": "Derivative-Anteil: Bremst bei Annäherung ans Ziel um Überschwingen zu vermeiden."}
+    ),
+    CONF_KA: MappingProxyType(
+        {"description": "Wettergeführte Vorsteuerung: Erhöht Heizleistung bei Kälte draußen (wenn Außensensor konfiguriert)."}
+    ),
+    CONF_ROOM_POWER_SHARE: MappingProxyType(
+        {"description": "Gewichtung dieses Heizkreises im gemeinsamen Raum-Regler (1.0 = normal, 0.5 = halb so stark, >1.0 = stärker)."}
+    ),
+})
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -33,102 +170,26 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up SonClouTRV number platform."""
-    
-    numbers = [
-        SonClouTRVNumber(
-            hass,
-            config_entry,
-            "hysteresis",
-            "Hysterese",
-            0.1,
-            2.0,
-            0.1,
-            "°C",
-            "mdi:thermometer-lines",
-            0.15,  # Default value (entspricht DEFAULT_HYSTERESIS)
-            "Temperaturbereich, in dem das Ventil nicht verändert wird. Verhindert ständiges Schalten. Empfehlung: 0,15-0,5°C.",
-        ),
-        SonClouTRVNumber(
-            hass,
-            config_entry,
-            "min_valve_update_interval",
-            "Trägheit (Min. Update-Intervall)",
-            1,
-            60,
-            1,
-            UnitOfTime.MINUTES,
-            "mdi:timer-sand",
-            10,  # Default: 10 minutes
-            "Minimale Zeit zwischen Ventil-Anpassungen. Höhere Werte = träger. Empfehlung: 10-20 Min für Fußbodenheizung.",
-        ),
-        SonClouTRVNumber(
-            hass,
-            config_entry,
-            CONF_KP,
-            "PID: P-Gain (Kp)",
-            1.0,
-            100.0,
-            1.0,
-            "%/°C",
-            "mdi:thermometer-lines",
-            DEFAULT_KP,
-            "Proportional-Anteil: Basis-Leistung basierend auf Temperaturdifferenz. Höher = aggressiver.",
-        ),
-        SonClouTRVNumber(
-            hass,
-            config_entry,
-            CONF_KI,
-            "PID: I-Gain (Ki - Lernen)",
-            0.0,
-            0.5,
-            0.001,
-            "%/°C/s",
-            "mdi:chart-bell-curve-cumulative",
-            DEFAULT_KI,
-            "Integral-Anteil: 'Lernt' den Wärmebedarf über die Zeit. Gleicht langfristige Abweichungen aus.",
-        ),
-        SonClouTRVNumber(
-            hass,
-            config_entry,
-            CONF_KD,
-            "PID: D-Gain (Kd - Dämpfung)",
-            0.0,
-            2000.0,
-            10.0,
-            "%/°C/s",
-            "mdi:speedometer-slow",
-            DEFAULT_KD,
-            "Derivative-Anteil: Bremst bei Annäherung ans Ziel um Überschwingen zu vermeiden.",
-        ),
-        SonClouTRVNumber(
-            hass,
-            config_entry,
-            CONF_KA,
-            "Feed-Forward: Außen-Gain (Ka)",
-            0.0,
-            10.0,
-            0.1,
-            "%/°C",
-            "mdi:weather-cloudy-arrow-right",
-            DEFAULT_KA,
-            "Wettergeführte Vorsteuerung: Erhöht Heizleistung bei Kälte draußen (wenn Außensensor konfiguriert).",
-        ),
-        SonClouTRVNumber(
-            hass,
-            config_entry,
-            CONF_ROOM_POWER_SHARE,
-            "Raum-Leistungsanteil",
-            0.1,
-            1.5,
-            0.05,
-            "",
-            "mdi:home-thermometer-outline",
-            DEFAULT_ROOM_POWER_SHARE,
-            "Gewichtung dieses Heizkreises im gemeinsamen Raum-Regler (1.0 = normal, 0.5 = halb so stark, >1.0 = stärker).",
-        ),
-    ]
-    
-    async_add_entities(numbers, True)
+    # Device info for grouping (shared by all numbers of this entry)
+    device_info = DeviceInfo(
+        identifiers={(DOMAIN, config_entry.entry_id)},
+        name=f"SonTRV {config_entry.data['name']}",
+        manufacturer=MANUFACTURER,
+        model=MODEL,
+        sw_version="1.0.0",
+    )
+
+    # Common name / unique_id prefixes, built once for all numbers
+    name_prefix = config_entry.data["name"]
+    uid_prefix = f"{DOMAIN}_{config_entry.entry_id}_"
+
+    async_add_entities(
+        [
+            SonClouTRVNumber(hass, config_entry, device_info, name_prefix, uid_prefix, *spec)
+            for spec in _NUMBER_SPECS
+        ],
+        True,
+    )
 
 
 class SonClouTRVNumber(NumberEntity):
@@ -138,6 +199,9 @@ class SonClouTRVNumber(NumberEntity):
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
+        device_info: DeviceInfo,
+        name_prefix: str,
+        uid_prefix: str,
         setting_id: str,
         name: str,
         min_value: float,
@@ -146,15 +210,14 @@ class SonClouTRVNumber(NumberEntity):
         unit: str,
         icon: str,
         default_value: float,
-        description: str | None = None,
     ) -> None:
         """Initialize the number entity."""
         self.hass = hass
         self._config_entry = config_entry
         self._setting_id = setting_id
         self._attr_translation_key = setting_id
-        self._attr_name = f"{config_entry.data['name']} {name}"
-        self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_{setting_id}"
+        self._attr_name = f"{name_prefix} {name}"
+        self._attr_unique_id = uid_prefix + setting_id
         self._attr_native_min_value = min_value
         self._attr_native_max_value = max_value
         self._attr_native_step = step
@@ -167,71 +230,95 @@ class SonClouTRVNumber(NumberEntity):
         self._attr_native_value = saved_value if saved_value is not None else default_value
         
         # Device info for grouping
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"SonTRV {config_entry.data['name']}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
-            sw_version="1.0.0",
-        )
+        self._attr_device_info = device_info
         
-        # Store description
-        if description:
-            self._attr_extra_state_attributes = {"description": description}
+        # Description (shared, read-only attributes)
+        self._attr_extra_state_attributes = _DESCRIPTIONS.get(setting_id)
+
+        # Per-entry bucket in hass.data (created in __init__.async_setup_entry
+        # before the platforms are set up, replaced together with us on reload)
+        self._entry_bucket: dict[str, Any] = hass.data[DOMAIN][config_entry.entry_id]
+
+        # Handle of the debounced options write (see _async_flush_options)
+        self._pending_persist: CALLBACK_TYPE | None = None
+        # Whether the pending value was already applied to the climate entity
+        self._value_applied = False
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
+        # Frontend re-sends the current value e.g. on reconnect: nothing to do
+        if (
+            self._attr_native_value is not None
+            and abs(value - self._attr_native_value) < self._attr_native_step / 2
+        ):
+            return
+
         self._attr_native_value = value
         
         try:
-            # Get the climate entity from registry
-            found = False
-            for entity in self.hass.data[DOMAIN].get(self._config_entry.entry_id, {}).get("entities", []):
-                if hasattr(entity, '_entity_id_base'):
-                    found = True
-                    if self._setting_id == "hysteresis":
-                        entity._hysteresis = value
-                        _LOGGER.info("%s: Hysteresis set to %.1f°C", entity.name, value)
-                    elif self._setting_id == "min_valve_update_interval":
-                        # Convert minutes to seconds
-                        entity._min_valve_update_interval = int(value * 60)
-                        _LOGGER.info("%s: Min valve update interval set to %d minutes", entity.name, int(value))
-                    elif self._setting_id == CONF_KP:
-                        entity._kp = value
-                        _LOGGER.info("%s: PID Kp set to %.1f", entity.name, value)
-                    elif self._setting_id == CONF_KI:
-                        entity._ki = value
-                        _LOGGER.info("%s: PID Ki set to %.3f", entity.name, value)
-                    elif self._setting_id == CONF_KD:
-                        entity._kd = value
-                        _LOGGER.info("%s: PID Kd set to %.1f", entity.name, value)
-                    elif self._setting_id == CONF_KA:
-                        entity._ka = value
-                        _LOGGER.info("%s: Feed-Forward Ka set to %.1f", entity.name, value)
-                    elif self._setting_id == CONF_ROOM_POWER_SHARE:
-                        try:
-                            share = float(value)
-                        except (TypeError, ValueError):
-                            share = DEFAULT_ROOM_POWER_SHARE
-                        # Clamp defensively
-                        share = max(0.0, min(2.0, share))
-                        entity._room_power_share = share
-                        _LOGGER.info("%s: Room power share set to %.2f", entity.name, share)
-                    elif self._setting_id == "proportional_gain": # Legacy
-                         entity._kp = value
-                    break
-            
-            if not found:
+            # Get the climate entity of this entry (registered by the climate platform)
+            entity = self._entry_bucket.get("climate")
+            self._value_applied = False
+            if entity is None:
                 _LOGGER.warning("%s: Climate entity not found in registry, value not applied", self._attr_name)
-            
-            # Persist the value to config_entry.options
-            # This ensures the value survives a restart
-            self.hass.config_entries.async_update_entry(
-                self._config_entry,
-                options={**self._config_entry.options, self._setting_id: value},
+            elif (setter := _SETTERS.get(self._setting_id)) is not None:
+                setter(entity, value)
+                self._value_applied = True
+                _LOGGER.debug("%s: %s set to %s", entity.name, self._setting_id, value)
+
+            # Persist the value to config_entry.options (debounced), so it
+            # survives a restart without one entry update per step click
+            if self._pending_persist is not None:
+                self._pending_persist()
+            self._pending_persist = async_call_later(
+                self.hass, PERSIST_DELAY, self._async_flush_options
             )
-            _LOGGER.debug("%s: Saved %s = %.1f to config_entry", self._attr_name, self._setting_id, value)
+            self._entry_bucket["pending_numbers"].add(self)
         except Exception as err:
             _LOGGER.error("%s: Error setting native value: %s", self._attr_name, err)
         
         self.async_write_ha_state()
+
+    @callback
+    def _async_flush_options(self, _now=None) -> None:
+        """Write the current value to config_entry.options."""
+        self._pending_persist = None
+        self._entry_bucket["pending_numbers"].discard(self)
+        opts = self._config_entry.options.copy()
+        opts[self._setting_id] = self._attr_native_value
+        if (
+            self.hass.config_entries.async_update_entry(self._config_entry, options=opts)
+            and self._value_applied
+        ):
+            # Already active at runtime: the update listener skips the reload
+            runtime_updates = self.hass.data[DOMAIN]["runtime_updates"]
+            entry_id = self._config_entry.entry_id
+            runtime_updates[entry_id] = runtime_updates.get(entry_id, 0) + 1
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "%s: Saved %s = %s to config_entry",
+                self._attr_name,
+                self._setting_id,
+                self._attr_native_value,
+            )
+
+    @callback
+    def async_flush_pending(self, _event=None) -> None:
+        """Write a still pending value to config_entry.options right away."""
+        if self._pending_persist is None:
+            return
+        self._pending_persist()
+        self._async_flush_options()
+
+    async def async_added_to_hass(self) -> None:
+        """Save a pending value when Home Assistant stops."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, self.async_flush_pending)
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Persist a still pending value before the entity goes away."""
+        # Normally already done by async_unload_entry; covers entity removal.
+        # An applied value does not trigger a reload (runtime_updates).
+        self.async_flush_pending()
@@ -13,6 +13,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     DOMAIN,
+    MANUFACTURER,
+    MODEL,
     CONTROL_MODE_BINARY,
     CONTROL_MODE_PROPORTIONAL,
     CONTROL_MODE_PID,
@@ -21,6 +23,13 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Selectable control modes (shared by all select entities)
+_CONTROL_MODE_OPTIONS = (
+    CONTROL_MODE_BINARY,
+    CONTROL_MODE_PROPORTIONAL,
+    CONTROL_MODE_PID,
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -58,18 +67,14 @@ class SonClouTRVControlModeSelect(SelectEntity):
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, config_entry.entry_id)},
             name=f"SonTRV {name}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
+            manufacturer=MANUFACTURER,
+            model=MODEL,
             sw_version="1.0.0",
             configuration_url="https://github.com/k2dp2k/soncloutrv",
         )
         
         # Options
-        self._attr_options = [
-            CONTROL_MODE_BINARY,
-            CONTROL_MODE_PROPORTIONAL,
-            CONTROL_MODE_PID,
-        ]
+        self._attr_options = _CONTROL_MODE_OPTIONS
         
         # Current value (default: PID, see DEFAULT_CONTROL_MODE)
         self._attr_current_option = config_entry.data.get(
@@ -81,28 +86,38 @@ class SonClouTRVControlModeSelect(SelectEntity):
         if option not in self._attr_options:
             _LOGGER.error("Invalid control mode: %s", option)
             return
+        if option == self._attr_current_option:
+            # Unchanged: avoid a config entry update (and thus a reload)
+            return
         
         old_option = self._attr_current_option
         self._attr_current_option = option
         
-        # Update config entry data
-        new_data = dict(self._config_entry.data)
-        new_data["control_mode"] = option
+        # Switch the running climate entity directly (no reload needed)
+        entry_id = self._config_entry.entry_id
+        entry_data = self.hass.data[DOMAIN].get(entry_id, {})
+        climate = entry_data.get("climate")
+        if climate is not None:
+            await climate.async_set_control_mode(option)
 
-        # Trigger a config_entry update. Our update listener in __init__.py
-        # (`entry.add_update_listener(async_reload_entry)`) will take care of
-        # unloading/reloading the integration. We do NOT call async_reload
-        # directly here to avoid double reloads and potential race conditions.
-        self.hass.config_entries.async_update_entry(
-            self._config_entry, data=new_data
-        )
+        # Persist the mode. Our update listener in __init__.py
+        # (`entry.add_update_listener(async_reload_entry)`) skips the reload
+        # for updates counted in "runtime_updates"; without a climate entity
+        # the regular reload picks up the new mode.
+        if (
+            self.hass.config_entries.async_update_entry(
+                self._config_entry,
+                data={**self._config_entry.data, "control_mode": option},
+            )
+            and climate is not None
+        ):
+            runtime_updates = self.hass.data[DOMAIN]["runtime_updates"]
+            runtime_updates[entry_id] = runtime_updates.get(entry_id, 0) + 1
 
         _LOGGER.info(
-            "Control mode changed from %s to %s (reload handled by update listener)",
+            "Control mode changed from %s to %s",
             old_option,
             option,
         )
 
-        # Update our own state immediately; new climate entity will be created
-        # by the reload triggered via the update listener.
         self.async_write_ha_state()
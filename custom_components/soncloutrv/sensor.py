@@ -4,6 +4,7 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timedelta
 from collections import deque
+from collections.abc import Callable
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -19,22 +20,31 @@ from homeassistant.const import (
     UnitOfTime,
     UnitOfEnergy,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_track_state_change_event, async_track_time_interval
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers import entity_registry as er, device_registry as dr
-from homeassistant.util import dt as dt_util
+from homeassistant.util import dt as dt_util, slugify
 from homeassistant.const import CONF_NAME
 
-from .const import DOMAIN, CONF_VALVE_ENTITY, CONF_TEMP_SENSOR, CONF_ROOM_ID
+from .const import (
+    DOMAIN,
+    MANUFACTURER,
+    MODEL,
+    CONF_VALVE_ENTITY,
+    CONF_TEMP_SENSOR,
+    CONF_ROOM_ID,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 # Constants for calculations
 HEATING_POWER_PER_PERCENT = 0.05  # kW per valve % (adjustable estimate)
 SCAN_INTERVAL = timedelta(minutes=1)  # Update statistics every minute
+# Period of the shared sensor ticker; all sensor intervals are multiples of it
+TICK_INTERVAL = timedelta(minutes=1)
 
 
 async def async_setup_entry(
@@ -50,6 +60,11 @@ async def async_setup_entry(
 
     # Collect all sensors we will create for this config entry
     sensors: list[SensorEntity] = []
+
+    # Device info for grouping, built once and shared by all sensors of this
+    # entry (the TRV proxies keep their own sw_version)
+    device_info = get_device_info(config_entry)
+    proxy_device_info = get_device_info(config_entry, sw_version="1.1.0")
     
     # === BASIC PROXY SENSORS ===
     # Improved Discovery: Look up entities via device registry if possible
@@ -71,11 +86,8 @@ async def async_setup_entry(
     valve_close_entity = None  # Proxy entity from TRV (closing)
     
     if device_id:
-        # Iterate over all entities of this device
-        device_entities = [
-            entry for entry in entity_reg.entities.values() 
-            if entry.device_id == device_id
-        ]
+        # Entities of this device (indexed registry lookup, no full scan)
+        device_entities = er.async_entries_for_device(entity_reg, device_id)
         
         for entry in device_entities:
             # Skip disabled entities
@@ -129,7 +141,7 @@ async def async_setup_entry(
     # Register found sensors
     if battery_entity:
         sensors.append(SonClouTRVProxySensor(
-            hass, config_entry, battery_entity,
+            hass, config_entry, proxy_device_info, battery_entity,
             "TRV Batterie", "mdi:battery",
             "Batterieladung des SONOFF TRVZB.",
         ))
@@ -139,7 +151,7 @@ async def async_setup_entry(
         
     if temp_entity:
         sensors.append(SonClouTRVProxySensor(
-            hass, config_entry, temp_entity,
+            hass, config_entry, proxy_device_info, temp_entity,
             "TRV Temperatur", "mdi:thermometer",
             "Vom SONOFF TRVZB gemessene Temperatur.",
         ))
@@ -165,9 +177,8 @@ async def async_setup_entry(
     climate_entity_id = None
     
     # Search for climate entity with matching config_entry_id
-    for entity in entity_reg.entities.values():
-        if (entity.config_entry_id == config_entry.entry_id and 
-            entity.domain == "climate"):
+    for entity in er.async_entries_for_config_entry(entity_reg, config_entry.entry_id):
+        if entity.domain == "climate":
             climate_entity_id = entity.entity_id
             break
     
@@ -178,8 +189,8 @@ async def async_setup_entry(
              climate_entity_id = valve_entity # Use the wrapped entity? No, we need OUR entity.
         
         # Fallback 2: Construct expected entity ID from name
-        climate_name = config_entry.data.get(CONF_NAME, '').lower().replace(' ', '_')
-        # Handle default HA naming normalization (umlauts, etc.) somewhat simply
+        # slugify = same normalization HA uses for entity ids (umlauts, etc.)
+        climate_name = slugify(config_entry.data.get(CONF_NAME, ''))
         climate_entity_id = (
             f"climate.sontrv_{climate_name}"
             if not climate_name.startswith("sontrv")
@@ -204,7 +215,7 @@ async def async_setup_entry(
     room_temp_registry: set[str] = domain_data.setdefault("room_temp_sensors", set())
 
     if room_key and room_key not in room_sensor_registry and climate_entity_id:
-        sensors.append(SonClouTRVRoomPIDSensor(hass, config_entry, climate_entity_id, room_key))
+        sensors.append(SonClouTRVRoomPIDSensor(hass, config_entry, device_info, climate_entity_id, room_key))
         room_sensor_registry.add(room_key)
         _LOGGER.info("Added room-level PID debug sensor for room '%s'", room_key)
 
@@ -212,55 +223,61 @@ async def async_setup_entry(
     # Temperaturquelle für diesen Raum spiegelt, so dass verbundene Räume einen
     # gemeinsamen Temperaturwert haben.
     if room_key and room_key not in room_temp_registry and temp_sensor:
-        sensors.append(SonClouTRVRoomTemperatureSensor(hass, config_entry, temp_sensor, room_key))
+        sensors.append(SonClouTRVRoomTemperatureSensor(hass, config_entry, device_info, temp_sensor, room_key))
         room_temp_registry.add(room_key)
         _LOGGER.info("Added room-level temperature sensor for room '%s'", room_key)
 
     # Always add native SonTRV valve position sensor (reads from climate entity)
     # Pass the found climate_entity_id to avoid looking it up again
-    sensors.append(SonClouTRVNativeValvePositionSensor(hass, config_entry, climate_entity_id))
+    sensors.append(SonClouTRVNativeValvePositionSensor(hass, config_entry, device_info, climate_entity_id))
     _LOGGER.info("Added native SonTRV valve position sensor")
 
     # Native closing sensor (100 - valve_position from climate attributes)
-    sensors.append(SonClouTRVNativeValveClosingSensor(hass, config_entry, climate_entity_id))
+    sensors.append(SonClouTRVNativeValveClosingSensor(hass, config_entry, device_info, climate_entity_id))
     _LOGGER.info("Added native SonTRV valve closing sensor")
     
+    # One shared state listener on the TRV valve position for the valve
+    # statistics sensors below (instead of one listener per sensor)
+    valve_dispatcher = (
+        ValvePositionDispatcher(hass, valve_pos_entity) if valve_pos_entity else None
+    )
+
     # 1. Energy & Efficiency
     sensors.extend([
-        SonClouTRVHeatingDurationSensor(hass, config_entry, valve_pos_entity, "today"),
-        SonClouTRVHeatingDurationSensor(hass, config_entry, valve_pos_entity, "week"),
-        SonClouTRVHeatingEnergySensor(hass, config_entry, valve_pos_entity),
-        SonClouTRVEfficiencySensor(hass, config_entry, climate_entity_id),
+        SonClouTRVHeatingDurationSensor(hass, config_entry, device_info, valve_dispatcher, "today"),
+        SonClouTRVHeatingDurationSensor(hass, config_entry, device_info, valve_dispatcher, "week"),
+        SonClouTRVHeatingEnergySensor(hass, config_entry, device_info, valve_dispatcher),
+        SonClouTRVEfficiencySensor(hass, config_entry, device_info, climate_entity_id),
     ])
     
     # 2. Valve Health & Maintenance
     sensors.extend([
-        SonClouTRVLastMovementSensor(hass, config_entry, valve_pos_entity),
-        SonClouTRVMovementCountSensor(hass, config_entry, valve_pos_entity),
-        SonClouTRVTotalRuntimeSensor(hass, config_entry, valve_pos_entity),
+        SonClouTRVLastMovementSensor(hass, config_entry, device_info, valve_dispatcher),
+        SonClouTRVMovementCountSensor(hass, config_entry, device_info, valve_dispatcher),
+        SonClouTRVTotalRuntimeSensor(hass, config_entry, device_info, valve_dispatcher),
     ])
     
     # 3. Temperature Analysis
     sensors.extend([
-        SonClouTRVTemperatureTrendSensor(hass, config_entry, climate_entity_id),
-        SonClouTRVAvgTemperatureSensor(hass, config_entry, climate_entity_id),
-        SonClouTRVMinMaxTemperatureSensor(hass, config_entry, climate_entity_id, "min"),
-        SonClouTRVMinMaxTemperatureSensor(hass, config_entry, climate_entity_id, "max"),
+        SonClouTRVTemperatureTrendSensor(hass, config_entry, device_info, climate_entity_id),
+        SonClouTRVAvgTemperatureSensor(hass, config_entry, device_info, climate_entity_id),
+        SonClouTRVMinMaxTemperatureSensor(hass, config_entry, device_info, climate_entity_id, "min"),
+        SonClouTRVMinMaxTemperatureSensor(hass, config_entry, device_info, climate_entity_id, "max"),
     ])
     
     # 4. Comfort & Optimization
     sensors.extend([
-        SonClouTRVTimeToTargetSensor(hass, config_entry, climate_entity_id),
-        SonClouTRVOverheatWarningSensor(hass, config_entry, climate_entity_id),
-        SonClouTRVUnderheatWarningSensor(hass, config_entry, climate_entity_id, valve_pos_entity),
+        SonClouTRVTimeToTargetSensor(hass, config_entry, device_info, climate_entity_id),
+        SonClouTRVOverheatWarningSensor(hass, config_entry, device_info, climate_entity_id),
+        SonClouTRVUnderheatWarningSensor(hass, config_entry, device_info, climate_entity_id, valve_pos_entity),
     ])
     
     # 5. System Status
     sensors.extend([
-        SonClouTRVConnectionStatusSensor(hass, config_entry, valve_entity),
-        SonClouTRVLastUpdateSensor(hass, config_entry, valve_entity),
-        SonClouTRVBatteryStatusSensor(hass, config_entry, base_entity_id),
-        SonClouTRVWindowStateSensor(hass, config_entry, climate_entity_id),
+        SonClouTRVConnectionStatusSensor(hass, config_entry, device_info, valve_entity),
+        SonClouTRVLastUpdateSensor(hass, config_entry, device_info, valve_entity),
+        SonClouTRVBatteryStatusSensor(hass, config_entry, device_info, base_entity_id),
+        SonClouTRVWindowStateSensor(hass, config_entry, device_info, climate_entity_id),
     ])
     
     # 6. PID Debug Sensors
@@ -271,7 +288,7 @@ async def async_setup_entry(
         ("pid_ff", "PID Feed-Forward", "mdi:weather-cloudy-arrow-right"),
         ("pid_integral_error", "PID Integral Summe", "mdi:sigma"),
     ]:
-        sensors.append(SonClouTRVPIDSensor(hass, config_entry, climate_entity_id, pid_attr, name_suffix, icon))
+        sensors.append(SonClouTRVPIDSensor(hass, config_entry, device_info, climate_entity_id, pid_attr, name_suffix, icon))
     
     async_add_entities(sensors, True)
 
@@ -283,6 +300,7 @@ class SonClouTRVProxySensor(SensorEntity):
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
+        device_info: DeviceInfo,
         source_entity_id: str,
         name: str,
         icon: str,
@@ -292,19 +310,16 @@ class SonClouTRVProxySensor(SensorEntity):
         self.hass = hass
         self._source_entity_id = source_entity_id
         self._attr_name = f"{config_entry.data['name']} {name}"
-        self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_{name.lower().replace(' ', '_')}"
+        # slugify == lower().replace(" ", "_") for the (ASCII) proxy names,
+        # so existing unique_ids stay the same
+        self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_{slugify(name)}"
         self._attr_icon = icon
         self._attr_native_value = None
-        self._remove_listener = None
+        # Last mirrored (state, unit, device_class, state_class) of the source
+        self._last_source: tuple[Any, ...] | None = None
         
         # Device info for grouping
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"SonTRV {config_entry.data['name']}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
-            sw_version="1.1.0",
-        )
+        self._attr_device_info = device_info
         
         if description:
             self._attr_extra_state_attributes = {"description": description, "source": source_entity_id}
@@ -314,35 +329,53 @@ class SonClouTRVProxySensor(SensorEntity):
         await super().async_added_to_hass()
         
         # Track source entity state changes
-        self._remove_listener = async_track_state_change_event(
-            self.hass,
-            [self._source_entity_id],
-            self._async_source_changed,
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self._source_entity_id],
+                self._async_source_changed,
+            )
         )
         
         # Initial update
-        await self._async_update_from_source()
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Run when entity will be removed."""
-        if self._remove_listener:
-            self._remove_listener()
+        self._update_from_source(self.hass.states.get(self._source_entity_id))
 
     @callback
-    async def _async_source_changed(self, event) -> None:
+    def _async_source_changed(self, event: Event) -> None:
         """Handle source entity state changes."""
-        await self._async_update_from_source()
-        self.async_write_ha_state()
+        if self._update_from_source(event.data.get("new_state")):
+            self.async_write_ha_state()
+
+    def _update_from_source(self, source_state: State | None) -> bool:
+        """Update sensor value from the source entity state.
 
-    async def _async_update_from_source(self) -> None:
-        """Update sensor value from source entity."""
-        source_state = self.hass.states.get(self._source_entity_id)
-        if source_state and source_state.state not in ("unavailable", "unknown"):
-            self._attr_native_value = source_state.state
+        Returns True if the mirrored values changed.
+        """
+        if not source_state or source_state.state in ("unavailable", "unknown"):
+            return False
+        attrs = source_state.attributes
+        mirrored = (
+            source_state.state,
             # Copy unit and device class from source
-            self._attr_native_unit_of_measurement = source_state.attributes.get("unit_of_measurement")
-            self._attr_device_class = source_state.attributes.get("device_class")
-            self._attr_state_class = source_state.attributes.get("state_class")
+            attrs.get("unit_of_measurement"),
+            attrs.get("device_class"),
+            attrs.get("state_class"),
+        )
+        if mirrored == self._last_source:
+            return False
+        self._last_source = mirrored
+        (
+            raw_value,
+            self._attr_native_unit_of_measurement,
+            self._attr_device_class,
+            self._attr_state_class,
+        ) = mirrored
+        # Parse numeric states once here instead of in every consumer
+        try:
+            self._attr_native_value = float(raw_value)
+        except (TypeError, ValueError):
+            self._attr_native_value = raw_value
+        return True
 
 
 class SonClouTRVNativeValvePositionSensor(SensorEntity):
@@ -357,13 +390,13 @@ class SonClouTRVNativeValvePositionSensor(SensorEntity):
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
+        device_info: DeviceInfo,
         climate_entity_id: str | None = None,
     ) -> None:
         """Initialize the native valve position sensor."""
         self.hass = hass
         self._config_entry = config_entry
         self._climate_entity_id = climate_entity_id
-        self._remove_listener = None
         
         self._attr_name = f"{config_entry.data[CONF_NAME]} Ventilposition"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_native_valve_position"
@@ -373,13 +406,7 @@ class SonClouTRVNativeValvePositionSensor(SensorEntity):
         self._attr_native_value = None
         
         # Device info for grouping
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"SonTRV {config_entry.data[CONF_NAME]}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
-            sw_version="1.1.1",
-        )
+        self._attr_device_info = device_info
         
         self._attr_extra_state_attributes = {
             "description": "Aktuelle Ventilöffnung von SonTRV (unabhängig vom TRV).",
@@ -393,9 +420,10 @@ class SonClouTRVNativeValvePositionSensor(SensorEntity):
         # If ID was not passed in init, try to find it (fallback)
         if not self._climate_entity_id:
             entity_reg = er.async_get(self.hass)
-            for entity in entity_reg.entities.values():
-                if (entity.config_entry_id == self._config_entry.entry_id 
-                    and entity.domain == "climate"):
+            for entity in er.async_entries_for_config_entry(
+                entity_reg, self._config_entry.entry_id
+            ):
+                if entity.domain == "climate":
                     self._climate_entity_id = entity.entity_id
                     _LOGGER.info(
                         "Native valve position sensor found climate entity: %s",
@@ -411,40 +439,39 @@ class SonClouTRVNativeValvePositionSensor(SensorEntity):
             return
         
         # Track climate entity state changes
-        self._remove_listener = async_track_state_change_event(
-            self.hass,
-            [self._climate_entity_id],
-            self._async_climate_changed,
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self._climate_entity_id],
+                self._async_climate_changed,
+            )
         )
         
         # Initial update
-        await self._async_update_from_climate()
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Run when entity will be removed."""
-        if self._remove_listener:
-            self._remove_listener()
+        self._update_from_climate(self.hass.states.get(self._climate_entity_id))
 
     @callback
-    async def _async_climate_changed(self, event) -> None:
+    def _async_climate_changed(self, event: Event) -> None:
         """Handle climate entity state changes."""
-        await self._async_update_from_climate()
-        self.async_write_ha_state()
+        if self._update_from_climate(event.data.get("new_state")):
+            self.async_write_ha_state()
 
-    async def _async_update_from_climate(self) -> None:
-        """Update valve position from climate entity attributes."""
-        if not self._climate_entity_id:
-            return
-        
-        climate_state = self.hass.states.get(self._climate_entity_id)
+    def _update_from_climate(self, climate_state: State | None) -> bool:
+        """Update valve position from climate entity attributes.
+
+        Returns True if the value changed.
+        """
         if not climate_state:
-            return
+            return False
         
         try:
             # Read valve_position from extra_state_attributes
             valve_position = climate_state.attributes.get("valve_position")
             if valve_position is not None:
-                self._attr_native_value = int(valve_position)
+                opening = int(valve_position)
+                if opening != self._attr_native_value:
+                    self._attr_native_value = opening
+                    return True
             else:
                 _LOGGER.debug(
                     "valve_position attribute not found in climate entity %s",
@@ -455,6 +482,7 @@ class SonClouTRVNativeValvePositionSensor(SensorEntity):
                 "Error reading valve_position from climate entity: %s",
                 err,
             )
+        return False
 
 
 class SonClouTRVNativeValveClosingSensor(SensorEntity):
@@ -468,13 +496,13 @@ class SonClouTRVNativeValveClosingSensor(SensorEntity):
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
+        device_info: DeviceInfo,
         climate_entity_id: str | None = None,
     ) -> None:
         """Initialize the native valve closing sensor."""
         self.hass = hass
         self._config_entry = config_entry
         self._climate_entity_id = climate_entity_id
-        self._remove_listener = None
 
         self._attr_name = f"{config_entry.data[CONF_NAME]} Ventilschließgrad"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_native_valve_closing"
@@ -484,13 +512,7 @@ class SonClouTRVNativeValveClosingSensor(SensorEntity):
         self._attr_native_value = None
 
         # Device info for grouping
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"SonTRV {config_entry.data[CONF_NAME]}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
-            sw_version="1.1.1",
-        )
+        self._attr_device_info = device_info
 
         self._attr_extra_state_attributes = {
             "description": "Aktueller Ventilschließgrad von SonTRV (100 - Ventilöffnung).",
@@ -504,11 +526,10 @@ class SonClouTRVNativeValveClosingSensor(SensorEntity):
         # If ID was not passed in init, try to find it (fallback)
         if not self._climate_entity_id:
             entity_reg = er.async_get(self.hass)
-            for entity in entity_reg.entities.values():
-                if (
-                    entity.config_entry_id == self._config_entry.entry_id
-                    and entity.domain == "climate"
-                ):
+            for entity in er.async_entries_for_config_entry(
+                entity_reg, self._config_entry.entry_id
+            ):
+                if entity.domain == "climate":
                     self._climate_entity_id = entity.entity_id
                     _LOGGER.info(
                         "Native valve closing sensor found climate entity: %s",
@@ -524,41 +545,39 @@ class SonClouTRVNativeValveClosingSensor(SensorEntity):
             return
 
         # Track climate entity state changes
-        self._remove_listener = async_track_state_change_event(
-            self.hass,
-            [self._climate_entity_id],
-            self._async_climate_changed,
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self._climate_entity_id],
+                self._async_climate_changed,
+            )
         )
 
         # Initial update
-        await self._async_update_from_climate()
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Run when entity will be removed."""
-        if self._remove_listener:
-            self._remove_listener()
+        self._update_from_climate(self.hass.states.get(self._climate_entity_id))
 
     @callback
-    async def _async_climate_changed(self, event) -> None:
+    def _async_climate_changed(self, event: Event) -> None:
         """Handle climate entity state changes."""
-        await self._async_update_from_climate()
-        self.async_write_ha_state()
+        if self._update_from_climate(event.data.get("new_state")):
+            self.async_write_ha_state()
 
-    async def _async_update_from_climate(self) -> None:
-        """Update closing degree from climate entity attributes."""
-        if not self._climate_entity_id:
-            return
+    def _update_from_climate(self, climate_state: State | None) -> bool:
+        """Update closing degree from climate entity attributes.
 
-        climate_state = self.hass.states.get(self._climate_entity_id)
+        Returns True if the value changed.
+        """
         if not climate_state:
-            return
+            return False
 
         try:
             valve_position = climate_state.attributes.get("valve_position")
             if valve_position is not None:
                 opening = int(valve_position)
                 closing = max(0, min(100, 100 - opening))
-                self._attr_native_value = closing
+                if closing != self._attr_native_value:
+                    self._attr_native_value = closing
+                    return True
             else:
                 _LOGGER.debug(
                     "valve_position attribute not found in climate entity %s (closing sensor)",
@@ -569,6 +588,7 @@ class SonClouTRVNativeValveClosingSensor(SensorEntity):
                 "Error reading valve_position for closing sensor from climate entity: %s",
                 err,
             )
+        return False
 
 
 class SonClouTRVWindowStateSensor(SensorEntity):
@@ -583,13 +603,13 @@ class SonClouTRVWindowStateSensor(SensorEntity):
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
+        device_info: DeviceInfo,
         climate_entity_id: str | None = None,
     ) -> None:
         """Initialize the window state sensor."""
         self.hass = hass
         self._config_entry = config_entry
         self._climate_entity_id = climate_entity_id
-        self._remove_listener = None
 
         self._attr_name = f"{config_entry.data[CONF_NAME]} Fensterstatus"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_window_state"
@@ -597,13 +617,7 @@ class SonClouTRVWindowStateSensor(SensorEntity):
         self._attr_native_value = "geschlossen"
 
         # Device info for grouping
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"SonTRV {config_entry.data[CONF_NAME]}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
-            sw_version="1.1.1",
-        )
+        self._attr_device_info = device_info
 
         self._attr_extra_state_attributes = {
             "description": "Automatisch erkannter Fensterzustand basierend auf plötzlichen Temperaturstürzen.",
@@ -618,11 +632,10 @@ class SonClouTRVWindowStateSensor(SensorEntity):
         # If ID was not passed in init, try to find it (fallback)
         if not self._climate_entity_id:
             entity_reg = er.async_get(self.hass)
-            for entity in entity_reg.entities.values():
-                if (
-                    entity.config_entry_id == self._config_entry.entry_id
-                    and entity.domain == "climate"
-                ):
+            for entity in er.async_entries_for_config_entry(
+                entity_reg, self._config_entry.entry_id
+            ):
+                if entity.domain == "climate":
                     self._climate_entity_id = entity.entity_id
                     _LOGGER.info(
                         "Window state sensor found climate entity: %s",
@@ -638,38 +651,39 @@ class SonClouTRVWindowStateSensor(SensorEntity):
             return
 
         # Track climate entity state changes
-        self._remove_listener = async_track_state_change_event(
-            self.hass,
-            [self._climate_entity_id],
-            self._async_climate_changed,
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self._climate_entity_id],
+                self._async_climate_changed,
+            )
         )
 
         # Initial update
-        await self._async_update_from_climate()
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Run when entity will be removed."""
-        if self._remove_listener:
-            self._remove_listener()
+        self._update_from_climate(self.hass.states.get(self._climate_entity_id))
 
     @callback
-    async def _async_climate_changed(self, event) -> None:
+    def _async_climate_changed(self, event: Event) -> None:
         """Handle climate entity state changes."""
-        await self._async_update_from_climate()
-        self.async_write_ha_state()
+        if self._update_from_climate(event.data.get("new_state")):
+            self.async_write_ha_state()
 
-    async def _async_update_from_climate(self) -> None:
-        """Update window state from climate entity attributes."""
-        if not self._climate_entity_id:
-            return
+    def _update_from_climate(self, climate_state: State | None) -> bool:
+        """Update window state from climate entity attributes.
 
-        climate_state = self.hass.states.get(self._climate_entity_id)
+        Returns True if the window state changed.
+        """
         if not climate_state:
-            return
+            return False
 
         attrs = climate_state.attributes or {}
         window_open = bool(attrs.get("window_open", False))
         window_since = attrs.get("window_freeze_since")
+        if (
+            window_open == self._attr_extra_state_attributes["window_open"]
+            and window_since == self._attr_extra_state_attributes["window_freeze_since"]
+        ):
+            return False
 
         # Map to German strings as requested
         self._attr_native_value = "offen" if window_open else "geschlossen"
@@ -679,6 +693,7 @@ class SonClouTRVWindowStateSensor(SensorEntity):
         extra["window_open"] = window_open
         extra["window_freeze_since"] = window_since
         self._attr_extra_state_attributes = extra
+        return True
 
 
 class SonClouTRVRoomTemperatureSensor(SensorEntity):
@@ -696,6 +711,7 @@ class SonClouTRVRoomTemperatureSensor(SensorEntity):
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
+        device_info: DeviceInfo,
         source_entity_id: str,
         room_key: str,
     ) -> None:
@@ -703,20 +719,13 @@ class SonClouTRVRoomTemperatureSensor(SensorEntity):
         self._config_entry = config_entry
         self._source_entity_id = source_entity_id
         self._room_key = room_key
-        self._remove_listener = None
 
         self._attr_name = f"{config_entry.data[CONF_NAME]} Raumtemperatur"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_room_temp_{room_key}"
         self._attr_icon = "mdi:home-thermometer"
         self._attr_native_value = None
 
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"SonTRV {config_entry.data[CONF_NAME]}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
-            sw_version="1.1.1",
-        )
+        self._attr_device_info = device_info
 
         self._attr_extra_state_attributes = {
             "description": "Aggregierte Raumtemperatur (externer Sensor für diesen Raum)",
@@ -726,31 +735,31 @@ class SonClouTRVRoomTemperatureSensor(SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(
-            self.hass,
-            [self._source_entity_id],
-            self._async_source_changed,
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self._source_entity_id],
+                self._async_source_changed,
+            )
         )
-        await self._async_update_from_source()
-
-    async def async_will_remove_from_hass(self) -> None:
-        if self._remove_listener:
-            self._remove_listener()
+        self._update_from_source(self.hass.states.get(self._source_entity_id))
 
     @callback
-    async def _async_source_changed(self, event) -> None:
-        await self._async_update_from_source()
-        self.async_write_ha_state()
+    def _async_source_changed(self, event: Event) -> None:
+        if self._update_from_source(event.data.get("new_state")):
+            self.async_write_ha_state()
 
-    async def _async_update_from_source(self) -> None:
-        source_state = self.hass.states.get(self._source_entity_id)
+    def _update_from_source(self, source_state: State | None) -> bool:
         if not source_state or source_state.state in ("unavailable", "unknown"):
-            return
+            return False
         try:
             temp = float(source_state.state)
         except (TypeError, ValueError):
-            return
+            return False
+        if temp == self._attr_native_value:
+            return False
         self._attr_native_value = temp
+        return True
 
 
 class SonClouTRVRoomPIDSensor(SensorEntity):
@@ -770,6 +779,7 @@ class SonClouTRVRoomPIDSensor(SensorEntity):
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
+        device_info: DeviceInfo,
         climate_entity_id: str,
         room_key: str,
     ) -> None:
@@ -778,7 +788,6 @@ class SonClouTRVRoomPIDSensor(SensorEntity):
         self._config_entry = config_entry
         self._climate_entity_id = climate_entity_id
         self._room_key = room_key
-        self._remove_listener = None
 
         room_name = room_key
         self._attr_name = f"{config_entry.data[CONF_NAME]} Raum Heizbedarf"
@@ -788,13 +797,7 @@ class SonClouTRVRoomPIDSensor(SensorEntity):
 
         # Device info: group the room sensor with the SonTRV device so it shows
         # up next to the climate and number entities.
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"SonTRV {config_entry.data[CONF_NAME]}",
-            manufacturer="k2dp2k",
-            model="Smart Thermostat Control",
-            sw_version="1.1.1",
-        )
+        self._attr_device_info = device_info
 
         self._attr_extra_state_attributes = {
             "description": "Raum-PID-Debugsensor (gemeinsame Regelung für alle TRVs im Raum)",
@@ -814,27 +817,24 @@ class SonClouTRVRoomPIDSensor(SensorEntity):
 
         # Update when the associated climate entity updates; the PID logic runs
         # in the climate entity, which also updates the shared RoomPIDState.
-        self._remove_listener = async_track_state_change_event(
-            self.hass,
-            [self._climate_entity_id],
-            self._async_climate_changed,
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self._climate_entity_id],
+                self._async_climate_changed,
+            )
         )
 
         # Initial update
-        await self._async_update_from_room_state()
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Clean up listeners when the entity is removed."""
-        if self._remove_listener:
-            self._remove_listener()
+        self._update_from_room_state()
 
     @callback
-    async def _async_climate_changed(self, event) -> None:
+    def _async_climate_changed(self, event) -> None:
         """Handle climate entity state changes."""
-        await self._async_update_from_room_state()
+        self._update_from_room_state()
         self.async_write_ha_state()
 
-    async def _async_update_from_room_state(self) -> None:
+    def _update_from_room_state(self) -> None:
         """Read the shared RoomPIDState from hass.data and update attributes."""
         domain_data = self.hass.data.get(DOMAIN)
         if not domain_data:
@@ -876,25 +876,147 @@ class SonClouTRVRoomPIDSensor(SensorEntity):
 
 
 # Helper function for device info
-def get_device_info(config_entry: ConfigEntry) -> DeviceInfo:
-    """Get standard device info for all sensors."""
+def get_device_info(config_entry: ConfigEntry, sw_version: str = "1.1.1") -> DeviceInfo:
+    """Build the standard device info of an entry's sensors."""
     return DeviceInfo(
         identifiers={(DOMAIN, config_entry.entry_id)},
         name=f"SonTRV {config_entry.data[CONF_NAME]}",
-        manufacturer="k2dp2k",
-        model="Smart Thermostat Control",
-        sw_version="1.1.1",
+        manufacturer=MANUFACTURER,
+        model=MODEL,
+        sw_version=sw_version,
     )
 
 
+def _parse_valve_position(state: State | None) -> float | None:
+    """Return the valve position of a state, None if unavailable or invalid."""
+    if not state or state.state in ("unavailable", "unknown"):
+        return None
+    try:
+        return float(state.state)
+    except (ValueError, TypeError):
+        return None
+
+
+class ValvePositionDispatcher:
+    """Shared state listener on the TRV valve position entity of an entry.
+
+    The valve statistics sensors register their update callbacks here; the
+    state change subscription exists while at least one of them is added.
+    Each change is parsed once and handed out as (position, now).
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
+        self.hass = hass
+        self.entity_id = entity_id
+        self._listeners: list[Callable[[float, datetime], None]] = []
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_current_position(self) -> float | None:
+        """Return the current valve position from the state machine."""
+        return _parse_valve_position(self.hass.states.get(self.entity_id))
+
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[float, datetime], None]
+    ) -> CALLBACK_TYPE:
+        """Register a callback for valve position changes, return its remover."""
+        self._listeners.append(update_callback)
+        if self._unsub is None:
+            self._unsub = async_track_state_change_event(
+                self.hass, [self.entity_id], self._async_state_changed
+            )
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+            if not self._listeners and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return remove_listener
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Hand the new valve position to all registered sensors."""
+        pos = _parse_valve_position(event.data.get("new_state"))
+        if pos is None:
+            return
+        now = dt_util.now()
+        for update_callback in tuple(self._listeners):
+            update_callback(pos, now)
+
+
+class SensorTicker:
+    """Single timer driving the periodic work of all SonClouTRV sensors.
+
+    Sensors register (period in ticks, callback) instead of installing their
+    own time interval; the timer runs while at least one callback is
+    registered.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._listeners: list[tuple[int, Callable[[datetime], None]]] = []
+        self._unsub: CALLBACK_TYPE | None = None
+        self._ticks = 0
+
+    @callback
+    def async_add_listener(
+        self, period: int, tick_callback: Callable[[datetime], None]
+    ) -> CALLBACK_TYPE:
+        """Call tick_callback every `period` ticks, return its remover."""
+        listener = (period, tick_callback)
+        self._listeners.append(listener)
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass, self._async_tick, TICK_INTERVAL
+            )
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+            if not self._listeners and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return remove_listener
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Run the callbacks that are due on this tick."""
+        self._ticks += 1
+        for period, tick_callback in tuple(self._listeners):
+            if self._ticks % period:
+                continue
+            try:
+                tick_callback(now)
+            except Exception:
+                _LOGGER.exception("Error in periodic sensor update %s", tick_callback)
+
+
+@callback
+def async_track_sensor_tick(
+    hass: HomeAssistant,
+    interval: timedelta,
+    tick_callback: Callable[[datetime], None],
+) -> CALLBACK_TYPE:
+    """Run tick_callback every `interval` on the shared sensor ticker."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    ticker = domain_data.get("sensor_ticker")
+    if ticker is None:
+        ticker = domain_data["sensor_ticker"] = SensorTicker(hass)
+    return ticker.async_add_listener(max(1, int(interval / TICK_INTERVAL)), tick_callback)
+
+
 # ===== 1. ENERGY & EFFICIENCY SENSORS =====
 
 class SonClouTRVHeatingDurationSensor(RestoreEntity, SensorEntity):
     """Track heating duration (today/week)."""
 
-    def __init__(self, hass, config_entry, valve_entity, period):
+    def __init__(self, hass, config_entry, device_info, valve_dispatcher, period):
         self.hass = hass
-        self._valve_entity = valve_entity
+        self._valve_dispatcher = valve_dispatcher
         self._period = period
         self._attr_name = f"{config_entry.data['name']} Heizdauer {period.capitalize()}"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_heating_duration_{period}"
@@ -902,7 +1024,7 @@ class SonClouTRVHeatingDurationSensor(RestoreEntity, SensorEntity):
         self._attr_native_unit_of_measurement = UnitOfTime.HOURS
         self._attr_device_class = SensorDeviceClass.DURATION
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._duration_seconds = 0
         self._last_valve_state = 0
         self._last_update = None
@@ -922,31 +1044,23 @@ class SonClouTRVHeatingDurationSensor(RestoreEntity, SensorEntity):
                 self._duration_seconds = float(last.state or 0) * 3600
             except (ValueError, TypeError):
                 pass
-        self._remove_listener = async_track_state_change_event(self.hass, [self._valve_entity], self._update)
-        self._remove_interval = async_track_time_interval(self.hass, self._check_reset, timedelta(minutes=1))
-        await self._update()
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+        self.async_on_remove(async_track_sensor_tick(self.hass, timedelta(minutes=1), self._check_reset))
+        if self._valve_dispatcher:
+            self.async_on_remove(self._valve_dispatcher.async_add_listener(self._update))
+            if (pos := self._valve_dispatcher.async_current_position()) is not None:
+                self._update(pos, dt_util.now())
 
     @callback
-    async def _update(self, event=None):
-        state = self.hass.states.get(self._valve_entity)
-        if not state or state.state in ("unavailable", "unknown"): return
-        try:
-            pos = float(state.state)
-            now = dt_util.now()
-            if self._last_update and self._last_valve_state > 0:
-                self._duration_seconds += (now - self._last_update).total_seconds()
-            self._last_valve_state = pos
-            self._last_update = now
-            self._attr_native_value = round(self._duration_seconds / 3600, 2)
-            self.async_write_ha_state()
-        except (ValueError, TypeError):
-            pass
+    def _update(self, pos: float, now: datetime) -> None:
+        if self._last_update and self._last_valve_state > 0:
+            self._duration_seconds += (now - self._last_update).total_seconds()
+        self._last_valve_state = pos
+        self._last_update = now
+        self._attr_native_value = round(self._duration_seconds / 3600, 2)
+        self.async_write_ha_state()
 
-    async def _check_reset(self, now=None):
+    @callback
+    def _check_reset(self, now=None):
         if dt_util.now() >= self._reset_time:
             self._duration_seconds = 0
             self._reset_time = self._get_next_reset()
@@ -957,16 +1071,16 @@ class SonClouTRVHeatingDurationSensor(RestoreEntity, SensorEntity):
 class SonClouTRVHeatingEnergySensor(RestoreEntity, SensorEntity):
     """Estimate heating energy based on valve position × time."""
 
-    def __init__(self, hass, config_entry, valve_entity):
+    def __init__(self, hass, config_entry, device_info, valve_dispatcher):
         self.hass = hass
-        self._valve_entity = valve_entity
+        self._valve_dispatcher = valve_dispatcher
         self._attr_name = f"{config_entry.data['name']} Geschätzte Heizenergie"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_heating_energy"
         self._attr_icon = "mdi:lightning-bolt"
         self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         self._attr_device_class = SensorDeviceClass.ENERGY
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._energy_kwh = 0
         self._last_valve_state = 0
         self._last_update = None
@@ -978,41 +1092,35 @@ class SonClouTRVHeatingEnergySensor(RestoreEntity, SensorEntity):
                 self._energy_kwh = float(last.state or 0)
             except (ValueError, TypeError):
                 pass
-        self._remove_listener = async_track_state_change_event(self.hass, [self._valve_entity], self._update)
-        self._remove_interval = async_track_time_interval(self.hass, self._update, SCAN_INTERVAL)
-        await self._update()
+        if self._valve_dispatcher:
+            self.async_on_remove(self._valve_dispatcher.async_add_listener(self._update))
+            self.async_on_remove(async_track_sensor_tick(self.hass, SCAN_INTERVAL, self._async_refresh))
+            self._async_refresh()
 
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+    @callback
+    def _async_refresh(self, now=None):
+        if (pos := self._valve_dispatcher.async_current_position()) is not None:
+            self._update(pos, dt_util.now())
 
     @callback
-    async def _update(self, event=None):
-        state = self.hass.states.get(self._valve_entity)
-        if not state or state.state in ("unavailable", "unknown"):
-            return
-        try:
-            pos = float(state.state)
-            now = dt_util.now()
-            if self._last_update and self._last_valve_state > 0:
-                hours = (now - self._last_update).total_seconds() / 3600
-                self._energy_kwh += (self._last_valve_state / 100) * HEATING_POWER_PER_PERCENT * hours
-            self._last_valve_state = pos
-            self._last_update = now
-            self._attr_native_value = round(self._energy_kwh, 3)
-            self._attr_extra_state_attributes = {
-                "power_per_percent_kw": HEATING_POWER_PER_PERCENT,
-                "current_power_kw": round((pos / 100) * HEATING_POWER_PER_PERCENT, 3),
-            }
-            self.async_write_ha_state()
-        except (ValueError, TypeError) as err:
-            _LOGGER.debug("Error updating energy sensor: %s", err)
+    def _update(self, pos: float, now: datetime) -> None:
+        if self._last_update and self._last_valve_state > 0:
+            hours = (now - self._last_update).total_seconds() / 3600
+            self._energy_kwh += (self._last_valve_state / 100) * HEATING_POWER_PER_PERCENT * hours
+        self._last_valve_state = pos
+        self._last_update = now
+        self._attr_native_value = round(self._energy_kwh, 3)
+        self._attr_extra_state_attributes = {
+            "power_per_percent_kw": HEATING_POWER_PER_PERCENT,
+            "current_power_kw": round((pos / 100) * HEATING_POWER_PER_PERCENT, 3),
+        }
+        self.async_write_ha_state()
 
 
 class SonClouTRVEfficiencySensor(SensorEntity):
     """Calculate heating efficiency (temp change per valve opening)."""
 
-    def __init__(self, hass, config_entry, climate_entity):
+    def __init__(self, hass, config_entry, device_info, climate_entity):
         self.hass = hass
         self._climate_entity = climate_entity
         self._attr_name = f"{config_entry.data['name']} Heizeffizienz"
@@ -1020,21 +1128,17 @@ class SonClouTRVEfficiencySensor(SensorEntity):
         self._attr_icon = "mdi:speedometer"
         self._attr_native_unit_of_measurement = "°C/%"
         self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._temp_history = deque(maxlen=10)
         self._valve_history = deque(maxlen=10)
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._climate_entity], self._track)
-        self._remove_interval = async_track_time_interval(self.hass, self._calc, timedelta(minutes=5))
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._climate_entity], self._track))
+        self.async_on_remove(async_track_sensor_tick(self.hass, timedelta(minutes=5), self._calc))
 
     @callback
-    async def _track(self, event):
+    def _track(self, event):
         state = self.hass.states.get(self._climate_entity)
         if state:
             temp = state.attributes.get("current_temperature")
@@ -1043,7 +1147,8 @@ class SonClouTRVEfficiencySensor(SensorEntity):
                 self._temp_history.append(float(temp))
                 self._valve_history.append(float(valve))
 
-    async def _calc(self, now=None):
+    @callback
+    def _calc(self, now=None):
         if len(self._temp_history) < 2:
             return
         if not self._valve_history or len(self._valve_history) == 0:
@@ -1068,14 +1173,14 @@ class SonClouTRVEfficiencySensor(SensorEntity):
 class SonClouTRVLastMovementSensor(RestoreEntity, SensorEntity):
     """Track when valve was last moved."""
 
-    def __init__(self, hass, config_entry, valve_entity):
+    def __init__(self, hass, config_entry, device_info, valve_dispatcher):
         self.hass = hass
-        self._valve_entity = valve_entity
+        self._valve_dispatcher = valve_dispatcher
         self._attr_name = f"{config_entry.data['name']} Letzte Ventilbewegung"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_last_movement"
         self._attr_icon = "mdi:valve"
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._last_pos = None
         self._last_movement = None
 
@@ -1086,40 +1191,31 @@ class SonClouTRVLastMovementSensor(RestoreEntity, SensorEntity):
                 self._last_movement = dt_util.parse_datetime(last.state)
             except (ValueError, TypeError):
                 pass
-        self._remove_listener = async_track_state_change_event(self.hass, [self._valve_entity], self._detect)
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
+        if self._valve_dispatcher:
+            self.async_on_remove(self._valve_dispatcher.async_add_listener(self._detect))
 
     @callback
-    async def _detect(self, event):
-        state = event.data.get("new_state")
-        if not state or state.state in ("unavailable", "unknown"):
-            return
-        try:
-            pos = float(state.state)
-            if self._last_pos is not None and abs(pos - self._last_pos) > 1:
-                self._last_movement = dt_util.now()
-                self._attr_native_value = self._last_movement
-                days = (dt_util.now() - self._last_movement).days if self._last_movement else 0
-                self._attr_extra_state_attributes = {"days_since_movement": days}
-                self.async_write_ha_state()
-            self._last_pos = pos
-        except (ValueError, TypeError):
-            pass
+    def _detect(self, pos: float, now: datetime) -> None:
+        if self._last_pos is not None and abs(pos - self._last_pos) > 1:
+            self._last_movement = now
+            self._attr_native_value = self._last_movement
+            # Movement happened just now
+            self._attr_extra_state_attributes = {"days_since_movement": 0}
+            self.async_write_ha_state()
+        self._last_pos = pos
 
 
 class SonClouTRVMovementCountSensor(RestoreEntity, SensorEntity):
     """Count valve movements."""
 
-    def __init__(self, hass, config_entry, valve_entity):
+    def __init__(self, hass, config_entry, device_info, valve_dispatcher):
         self.hass = hass
-        self._valve_entity = valve_entity
+        self._valve_dispatcher = valve_dispatcher
         self._attr_name = f"{config_entry.data['name']} Ventilbewegungen"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_movement_count"
         self._attr_icon = "mdi:counter"
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._count = 0
         self._last_pos = None
 
@@ -1130,40 +1226,31 @@ class SonClouTRVMovementCountSensor(RestoreEntity, SensorEntity):
                 self._count = int(last.state or 0)
             except (ValueError, TypeError):
                 pass
-        self._remove_listener = async_track_state_change_event(self.hass, [self._valve_entity], self._count_movement)
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
+        if self._valve_dispatcher:
+            self.async_on_remove(self._valve_dispatcher.async_add_listener(self._count_movement))
 
     @callback
-    async def _count_movement(self, event):
-        state = event.data.get("new_state")
-        if not state or state.state in ("unavailable", "unknown"):
-            return
-        try:
-            pos = float(state.state)
-            if self._last_pos is not None and abs(pos - self._last_pos) > 1:
-                self._count += 1
-                self._attr_native_value = self._count
-                self.async_write_ha_state()
-            self._last_pos = pos
-        except (ValueError, TypeError):
-            pass
+    def _count_movement(self, pos: float, now: datetime) -> None:
+        if self._last_pos is not None and abs(pos - self._last_pos) > 1:
+            self._count += 1
+            self._attr_native_value = self._count
+            self.async_write_ha_state()
+        self._last_pos = pos
 
 
 class SonClouTRVTotalRuntimeSensor(RestoreEntity, SensorEntity):
     """Track total valve runtime (lifetime)."""
 
-    def __init__(self, hass, config_entry, valve_entity):
+    def __init__(self, hass, config_entry, device_info, valve_dispatcher):
         self.hass = hass
-        self._valve_entity = valve_entity
+        self._valve_dispatcher = valve_dispatcher
         self._attr_name = f"{config_entry.data['name']} Ventil Gesamtlaufzeit"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_total_runtime"
         self._attr_icon = "mdi:clock-time-eight"
         self._attr_native_unit_of_measurement = UnitOfTime.HOURS
         self._attr_device_class = SensorDeviceClass.DURATION
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._runtime_seconds = 0
         self._last_valve = 0
         self._last_update = None
@@ -1175,30 +1262,24 @@ class SonClouTRVTotalRuntimeSensor(RestoreEntity, SensorEntity):
                 self._runtime_seconds = float(last.state or 0) * 3600
             except (ValueError, TypeError):
                 pass
-        self._remove_listener = async_track_state_change_event(self.hass, [self._valve_entity], self._update)
-        self._remove_interval = async_track_time_interval(self.hass, self._update, SCAN_INTERVAL)
+        if self._valve_dispatcher:
+            self.async_on_remove(self._valve_dispatcher.async_add_listener(self._update))
+            self.async_on_remove(async_track_sensor_tick(self.hass, SCAN_INTERVAL, self._async_refresh))
 
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+    @callback
+    def _async_refresh(self, now=None):
+        if (pos := self._valve_dispatcher.async_current_position()) is not None:
+            self._update(pos, dt_util.now())
 
     @callback
-    async def _update(self, event=None):
-        state = self.hass.states.get(self._valve_entity)
-        if not state or state.state in ("unavailable", "unknown"):
-            return
-        try:
-            pos = float(state.state)
-            now = dt_util.now()
-            if self._last_update and self._last_valve > 0:
-                delta = (now - self._last_update).total_seconds()
-                self._runtime_seconds += delta * (self._last_valve / 100)
-            self._last_valve = pos
-            self._last_update = now
-            self._attr_native_value = round(self._runtime_seconds / 3600, 1)
-            self.async_write_ha_state()
-        except (ValueError, TypeError):
-            pass
+    def _update(self, pos: float, now: datetime) -> None:
+        if self._last_update and self._last_valve > 0:
+            delta = (now - self._last_update).total_seconds()
+            self._runtime_seconds += delta * (self._last_valve / 100)
+        self._last_valve = pos
+        self._last_update = now
+        self._attr_native_value = round(self._runtime_seconds / 3600, 1)
+        self.async_write_ha_state()
 
 
 # ===== 3. TEMPERATURE ANALYSIS =====
@@ -1206,33 +1287,30 @@ class SonClouTRVTotalRuntimeSensor(RestoreEntity, SensorEntity):
 class SonClouTRVTemperatureTrendSensor(SensorEntity):
     """Analyze temperature trend (rising/falling/stable)."""
 
-    def __init__(self, hass, config_entry, climate_entity):
+    def __init__(self, hass, config_entry, device_info, climate_entity):
         self.hass = hass
         self._climate_entity = climate_entity
         self._attr_name = f"{config_entry.data['name']} Temperatur-Trend"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_temp_trend"
         self._attr_icon = "mdi:chart-line"
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._history = deque(maxlen=30)
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._climate_entity], self._track)
-        self._remove_interval = async_track_time_interval(self.hass, self._calc, timedelta(minutes=5))
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._climate_entity], self._track))
+        self.async_on_remove(async_track_sensor_tick(self.hass, timedelta(minutes=5), self._calc))
 
     @callback
-    async def _track(self, event):
+    def _track(self, event):
         state = self.hass.states.get(self._climate_entity)
         if state:
             temp = state.attributes.get("current_temperature")
             if temp is not None:
                 self._history.append((dt_util.now(), float(temp)))
 
-    async def _calc(self, now=None):
+    @callback
+    def _calc(self, now=None):
         if len(self._history) < 3: return
         recent = list(self._history)[-10:]
         if len(recent) < 2: return
@@ -1253,7 +1331,7 @@ class SonClouTRVTemperatureTrendSensor(SensorEntity):
 class SonClouTRVAvgTemperatureSensor(RestoreEntity, SensorEntity):
     """Calculate average daily temperature."""
 
-    def __init__(self, hass, config_entry, climate_entity):
+    def __init__(self, hass, config_entry, device_info, climate_entity):
         self.hass = hass
         self._climate_entity = climate_entity
         self._attr_name = f"{config_entry.data['name']} Durchschnittstemperatur"
@@ -1262,21 +1340,17 @@ class SonClouTRVAvgTemperatureSensor(RestoreEntity, SensorEntity):
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
         self._attr_device_class = SensorDeviceClass.TEMPERATURE
         self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._sum, self._count = 0, 0
         self._last_reset = dt_util.now()
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._climate_entity], self._track)
-        self._remove_interval = async_track_time_interval(self.hass, self._reset_check, timedelta(hours=1))
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._climate_entity], self._track))
+        self.async_on_remove(async_track_sensor_tick(self.hass, timedelta(hours=1), self._reset_check))
 
     @callback
-    async def _track(self, event):
+    def _track(self, event):
         state = self.hass.states.get(self._climate_entity)
         if state:
             temp = state.attributes.get("current_temperature")
@@ -1287,7 +1361,8 @@ class SonClouTRVAvgTemperatureSensor(RestoreEntity, SensorEntity):
                     self._attr_native_value = round(self._sum / self._count, 1)
                     self.async_write_ha_state()
 
-    async def _reset_check(self, now=None):
+    @callback
+    def _reset_check(self, now=None):
         if dt_util.now().date() != self._last_reset.date():
             self._sum, self._count = 0, 0
             self._last_reset = dt_util.now()
@@ -1298,7 +1373,7 @@ class SonClouTRVAvgTemperatureSensor(RestoreEntity, SensorEntity):
 class SonClouTRVMinMaxTemperatureSensor(RestoreEntity, SensorEntity):
     """Track min/max daily temperature."""
 
-    def __init__(self, hass, config_entry, climate_entity, sensor_type):
+    def __init__(self, hass, config_entry, device_info, climate_entity, sensor_type):
         self.hass = hass
         self._climate_entity = climate_entity
         self._type = sensor_type
@@ -1308,21 +1383,17 @@ class SonClouTRVMinMaxTemperatureSensor(RestoreEntity, SensorEntity):
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
         self._attr_device_class = SensorDeviceClass.TEMPERATURE
         self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._extreme = None
         self._last_reset = dt_util.now()
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._climate_entity], self._track)
-        self._remove_interval = async_track_time_interval(self.hass, self._reset_check, timedelta(hours=1))
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._climate_entity], self._track))
+        self.async_on_remove(async_track_sensor_tick(self.hass, timedelta(hours=1), self._reset_check))
 
     @callback
-    async def _track(self, event):
+    def _track(self, event):
         state = self.hass.states.get(self._climate_entity)
         if state:
             temp = state.attributes.get("current_temperature")
@@ -1335,7 +1406,8 @@ class SonClouTRVMinMaxTemperatureSensor(RestoreEntity, SensorEntity):
                 self._attr_native_value = round(self._extreme, 1)
                 self.async_write_ha_state()
 
-    async def _reset_check(self, now=None):
+    @callback
+    def _reset_check(self, now=None):
         if dt_util.now().date() != self._last_reset.date():
             self._extreme = None
             self._last_reset = dt_util.now()
@@ -1348,7 +1420,7 @@ class SonClouTRVMinMaxTemperatureSensor(RestoreEntity, SensorEntity):
 class SonClouTRVTimeToTargetSensor(SensorEntity):
     """Estimate time to reach target temperature."""
 
-    def __init__(self, hass, config_entry, climate_entity):
+    def __init__(self, hass, config_entry, device_info, climate_entity):
         self.hass = hass
         self._climate_entity = climate_entity
         self._attr_name = f"{config_entry.data['name']} Zeit bis Zieltemperatur"
@@ -1356,27 +1428,24 @@ class SonClouTRVTimeToTargetSensor(SensorEntity):
         self._attr_icon = "mdi:clock-fast"
         self._attr_native_unit_of_measurement = UnitOfTime.MINUTES
         self._attr_device_class = SensorDeviceClass.DURATION
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._history = deque(maxlen=10)
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._climate_entity], self._track)
-        self._remove_interval = async_track_time_interval(self.hass, self._calc, timedelta(minutes=5))
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._climate_entity], self._track))
+        self.async_on_remove(async_track_sensor_tick(self.hass, timedelta(minutes=5), self._calc))
 
     @callback
-    async def _track(self, event):
+    def _track(self, event):
         state = self.hass.states.get(self._climate_entity)
         if state:
             temp = state.attributes.get("current_temperature")
             if temp is not None:
                 self._history.append((dt_util.now(), float(temp)))
 
-    async def _calc(self, now=None):
+    @callback
+    def _calc(self, now=None):
         state = self.hass.states.get(self._climate_entity)
         if not state or len(self._history) < 2: return
         current = state.attributes.get("current_temperature")
@@ -1403,23 +1472,20 @@ class SonClouTRVTimeToTargetSensor(SensorEntity):
 class SonClouTRVOverheatWarningSensor(SensorEntity):
     """Warn when temperature exceeds target significantly."""
 
-    def __init__(self, hass, config_entry, climate_entity):
+    def __init__(self, hass, config_entry, device_info, climate_entity):
         self.hass = hass
         self._climate_entity = climate_entity
         self._attr_name = f"{config_entry.data['name']} Überhitzungswarnung"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_overheat_warning"
         self._attr_icon = "mdi:alert-circle"
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._climate_entity], self._check)
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._climate_entity], self._check))
 
     @callback
-    async def _check(self, event=None):
+    def _check(self, event=None):
         state = self.hass.states.get(self._climate_entity)
         if not state: return
         current = state.attributes.get("current_temperature")
@@ -1437,27 +1503,23 @@ class SonClouTRVOverheatWarningSensor(SensorEntity):
 class SonClouTRVUnderheatWarningSensor(SensorEntity):
     """Warn when valve fully open but temperature not rising."""
 
-    def __init__(self, hass, config_entry, climate_entity, valve_entity):
+    def __init__(self, hass, config_entry, device_info, climate_entity, valve_entity):
         self.hass = hass
         self._climate_entity = climate_entity
         self._valve_entity = valve_entity
         self._attr_name = f"{config_entry.data['name']} Unterheizungswarnung"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_underheat_warning"
         self._attr_icon = "mdi:alert-circle-outline"
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._history = deque(maxlen=10)
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._climate_entity, self._valve_entity], self._check)
-        self._remove_interval = async_track_time_interval(self.hass, self._check, timedelta(minutes=10))
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._climate_entity, self._valve_entity], self._check))
+        self.async_on_remove(async_track_sensor_tick(self.hass, timedelta(minutes=10), self._check))
 
     @callback
-    async def _check(self, event=None):
+    def _check(self, event=None):
         climate = self.hass.states.get(self._climate_entity)
         valve = self.hass.states.get(self._valve_entity)
         if not climate or not valve: return
@@ -1482,26 +1544,22 @@ class SonClouTRVUnderheatWarningSensor(SensorEntity):
 class SonClouTRVConnectionStatusSensor(SensorEntity):
     """Monitor MQTT/Zigbee connection quality."""
 
-    def __init__(self, hass, config_entry, valve_entity):
+    def __init__(self, hass, config_entry, device_info, valve_entity):
         self.hass = hass
         self._valve_entity = valve_entity
         self._attr_name = f"{config_entry.data['name']} Verbindungsstatus"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_connection_status"
         self._attr_icon = "mdi:wifi"
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         self._last_seen = None
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._valve_entity], self._check)
-        self._remove_interval = async_track_time_interval(self.hass, self._check, timedelta(minutes=5))
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
-        if hasattr(self, '_remove_interval'): self._remove_interval()
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._valve_entity], self._check))
+        self.async_on_remove(async_track_sensor_tick(self.hass, timedelta(minutes=5), self._check))
 
     @callback
-    async def _check(self, event=None):
+    def _check(self, event=None):
         state = self.hass.states.get(self._valve_entity)
         if not state or state.state in ("unavailable", "unknown"):
             self._attr_native_value, self._attr_icon = "offline", "mdi:wifi-off"
@@ -1514,24 +1572,21 @@ class SonClouTRVConnectionStatusSensor(SensorEntity):
 class SonClouTRVLastUpdateSensor(SensorEntity):
     """Show when last data was received."""
 
-    def __init__(self, hass, config_entry, valve_entity):
+    def __init__(self, hass, config_entry, device_info, valve_entity):
         self.hass = hass
         self._valve_entity = valve_entity
         self._attr_name = f"{config_entry.data['name']} Letztes Update"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_last_update"
         self._attr_icon = "mdi:clock-check"
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._valve_entity], self._update)
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._valve_entity], self._update))
 
     @callback
-    async def _update(self, event):
+    def _update(self, event):
         if (state := event.data.get("new_state")) and state.state not in ("unavailable", "unknown"):
             self._attr_native_value = dt_util.now()
             self.async_write_ha_state()
@@ -1540,14 +1595,14 @@ class SonClouTRVLastUpdateSensor(SensorEntity):
 class SonClouTRVBatteryStatusSensor(SensorEntity):
     """Show battery status as text (Gut/Mittel/Schwach)."""
 
-    def __init__(self, hass, config_entry, base_entity_id):
+    def __init__(self, hass, config_entry, device_info, base_entity_id):
         self.hass = hass
         self._base_entity_id = base_entity_id
         self._battery_entity = None
         self._attr_name = f"{config_entry.data['name']} Batteriestatus"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_battery_status"
         self._attr_icon = "mdi:battery"
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
@@ -1557,14 +1612,11 @@ class SonClouTRVBatteryStatusSensor(SensorEntity):
                 self._battery_entity = entity
                 break
         if self._battery_entity:
-            self._remove_listener = async_track_state_change_event(self.hass, [self._battery_entity], self._update)
-            await self._update()
-
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
+            self.async_on_remove(async_track_state_change_event(self.hass, [self._battery_entity], self._update))
+            self._update()
 
     @callback
-    async def _update(self, event=None):
+    def _update(self, event=None):
         if not self._battery_entity:
             return
         state = self.hass.states.get(self._battery_entity)
@@ -1589,7 +1641,7 @@ class SonClouTRVBatteryStatusSensor(SensorEntity):
 class SonClouTRVPIDSensor(SensorEntity):
     """Sensor to track internal PID values."""
 
-    def __init__(self, hass, config_entry, climate_entity, attribute, name_suffix, icon):
+    def __init__(self, hass, config_entry, device_info, climate_entity, attribute, name_suffix, icon):
         self.hass = hass
         self._climate_entity = climate_entity
         self._attribute = attribute
@@ -1601,25 +1653,25 @@ class SonClouTRVPIDSensor(SensorEntity):
         if attribute != "pid_integral_error":
             self._attr_native_unit_of_measurement = PERCENTAGE
             
-        self._attr_device_info = get_device_info(config_entry)
+        self._attr_device_info = device_info
         # Enable by default for debugging visibility
         self._attr_entity_registry_enabled_default = True
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._remove_listener = async_track_state_change_event(self.hass, [self._climate_entity], self._update)
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._climate_entity], self._update))
         # Initial update
-        await self._update()
+        self._update_from_state(self.hass.states.get(self._climate_entity))
 
-    async def async_will_remove_from_hass(self):
-        if hasattr(self, '_remove_listener'): self._remove_listener()
+    @callback
+    def _update(self, event: Event) -> None:
+        self._update_from_state(event.data.get("new_state"))
 
     @callback
-    async def _update(self, event=None):
-        state = self.hass.states.get(self._climate_entity)
+    def _update_from_state(self, state: State | None) -> None:
         if not state: return
         
         val = state.attributes.get(self._attribute)
-        if val is not None:
-            self._attr_native_value = float(val)
+        if val is not None and (value := float(val)) != self._attr_native_value:
+            self._attr_native_value = value
             self.async_write_ha_state()